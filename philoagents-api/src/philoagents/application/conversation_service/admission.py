@@ -0,0 +1,164 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+
+from philoagents.config import settings
+from philoagents.infrastructure.metrics import (
+    LATENCY_BUCKETS_SECONDS,
+    SIZE_BUCKETS,
+    Histogram,
+)
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a graph run can't be admitted because the server is saturated."""
+
+
+class AdmissionController:
+    """Process-wide limit on the number of concurrent workflow graph runs.
+
+    Up to `max_in_flight` runs execute at once. Further runs wait in a FIFO queue of at
+    most `max_queue_size` entries and are rejected straight away once it is full, or
+    after waiting `queue_timeout_seconds`. Like the conversation runtime, the controller
+    is bound to the event loop of the server; runs on other event loops (CLI tools and
+    evaluation jobs) are not limited.
+
+    Args:
+        max_in_flight: Maximum number of concurrent graph runs.
+        max_queue_size: Maximum number of graph runs waiting for a slot.
+        queue_timeout_seconds: Maximum time a graph run waits for a slot.
+    """
+
+    def __init__(
+        self, max_in_flight: int, max_queue_size: int, queue_timeout_seconds: float
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue_size = max_queue_size
+        self.queue_timeout_seconds = queue_timeout_seconds
+
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.admitted = 0
+        self.rejected = 0
+        self.queue_depth = Histogram(SIZE_BUCKETS)
+        self.wait_seconds = Histogram(LATENCY_BUCKETS_SECONDS)
+
+    def start(self) -> None:
+        """Bind the controller to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+        logger.info(
+            f"Admission control started | max in flight: {self.max_in_flight} | "
+            f"max queue size: {self.max_queue_size}"
+        )
+
+    def close(self) -> None:
+        """Unbind the controller from its event loop."""
+        self._loop = None
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a graph run slot for the duration of the context.
+
+        Raises:
+            AdmissionRejectedError: If the wait queue is full or the wait timed out.
+        """
+        if not self.__is_usable():
+            yield
+            return
+
+        await self.__acquire()
+        try:
+            yield
+        finally:
+            self.__release()
+
+    def stats(self) -> dict:
+        """Get the admission metrics.
+
+        Returns:
+            dict: Current load, admission counters, and the queue depth and wait time
+                histograms.
+        """
+        return {
+            "in_flight": self._in_flight,
+            "queued": len(self._waiters),
+            "max_in_flight": self.max_in_flight,
+            "max_queue_size": self.max_queue_size,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "queue_depth": self.queue_depth.snapshot(),
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+    async def __acquire(self) -> None:
+        self.queue_depth.observe(len(self._waiters))
+
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            self.admitted += 1
+            self.wait_seconds.observe(0)
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            self.rejected += 1
+            raise AdmissionRejectedError("Server is busy, please retry later.")
+
+        waiter = self._loop.create_future()
+        self._waiters.append(waiter)
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.queue_timeout_seconds):
+                await waiter
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right as the wait was interrupted.
+                self.__release()
+            else:
+                waiter.cancel()
+                # A release may have already dropped the waiter once it was cancelled.
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+            if isinstance(e, TimeoutError):
+                self.rejected += 1
+                raise AdmissionRejectedError(
+                    "Timed out waiting for the server, please retry later."
+                ) from e
+            raise
+
+        self.admitted += 1
+        self.wait_seconds.observe(time.monotonic() - start)
+
+    def __release(self) -> None:
+        # Hand the slot over to the oldest waiter, if any, instead of freeing it.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self._in_flight -= 1
+
+    def __is_usable(self) -> bool:
+        if self._loop is None:
+            return False
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+# Global admission controller instance
+admission_controller = AdmissionController(
+    max_in_flight=settings.ADMISSION_MAX_IN_FLIGHT,
+    max_queue_size=settings.ADMISSION_MAX_QUEUE_SIZE,
+    queue_timeout_seconds=settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+)
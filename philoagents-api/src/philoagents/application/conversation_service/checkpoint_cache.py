@@ -0,0 +1,318 @@
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+from philoagents.config import settings
+from philoagents.infrastructure.cache import TTLCache
+
+ThreadKey = tuple[str, str]
+
+# Estimated size of a cache entry besides its payloads, in bytes.
+ENTRY_OVERHEAD_BYTES = 512
+
+
+@dataclass(frozen=True)
+class CachedCheckpoint:
+    """The latest checkpoint of a thread, serialized, without pending writes."""
+
+    checkpoint_id: str
+    parent_checkpoint_id: Optional[str]
+    type: str
+    checkpoint: bytes
+    metadata_type: str
+    metadata: bytes
+
+    @property
+    def size(self) -> int:
+        """Approximate memory footprint of the entry, in bytes."""
+        return len(self.checkpoint) + len(self.metadata) + ENTRY_OVERHEAD_BYTES
+
+
+class CheckpointCache:
+    """LRU cache of the latest checkpoint of the conversation threads, bounded by bytes.
+
+    Entries are keyed by (thread ID, checkpoint namespace). Two counters guard against
+    caching stale checkpoints read or written concurrently with another change: the
+    generation counts every change, and the invalidations count the removals by resets
+    and compactions.
+
+    Args:
+        max_bytes: Maximum total size of the cached checkpoints, in bytes.
+        ttl_seconds: Seconds a checkpoint stays cached after it is stored.
+    """
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self._cache: TTLCache[ThreadKey, CachedCheckpoint] = TTLCache(
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            sizeof=lambda entry: entry.size,
+        )
+        self.generation = 0
+        self.invalidations = 0
+
+    def get(self, key: ThreadKey) -> Optional[CachedCheckpoint]:
+        """Get the latest checkpoint of a thread, if cached."""
+        return self._cache.get(key)
+
+    def put(
+        self,
+        key: ThreadKey,
+        entry: CachedCheckpoint,
+        invalidations: Optional[int] = None,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store the latest checkpoint of a thread, unless it may be stale.
+
+        Args:
+            key: The thread ID and checkpoint namespace.
+            entry: The checkpoint.
+            invalidations: Invalidation count when the checkpoint was written. The
+                checkpoint isn't stored if a reset happened since.
+            generation: Generation when the checkpoint was read. The checkpoint isn't
+                stored if anything changed since.
+        """
+        if invalidations is not None and invalidations != self.invalidations:
+            return
+        if generation is not None and generation != self.generation:
+            return
+
+        self.generation += 1
+        self._cache.put(key, entry)
+
+    def discard(self, key: ThreadKey) -> None:
+        """Drop the checkpoint of a thread, as it changed without a new checkpoint."""
+        self.generation += 1
+        self._cache.invalidate(key)
+
+    def invalidate_thread(self, thread_id: str) -> None:
+        """Drop the checkpoints of a thread, in every namespace."""
+        self.__invalidate_where(lambda key: key[0] == thread_id)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop the checkpoints of every thread of a user."""
+        prefix = f"{user_id}:"
+        self.__invalidate_where(lambda key: key[0].startswith(prefix))
+
+    def clear(self) -> None:
+        """Drop every checkpoint."""
+        self.generation += 1
+        self.invalidations += 1
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Get the cache metrics, including the hit rate."""
+        return self._cache.stats()
+
+    def __invalidate_where(self, predicate) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self._cache.invalidate_where(predicate)
+
+
+class CachedCheckpointSaver(BaseCheckpointSaver):
+    """Checkpoint saver serving the latest checkpoint of hot threads from memory.
+
+    Wraps another saver. Checkpoints are written through to it and cached serialized,
+    so a turn following another one on the same worker reads its checkpoint without a
+    database round-trip. Only checkpoints without pending writes are cached: storing
+    writes on a thread drops its cached checkpoint until the next one, as do resets of
+    the thread. Reads of older checkpoints and listings go to the wrapped saver.
+
+    The cache only sees the changes made through this process, so every thread must be
+    served by a single worker: with several workers or replicas, one of them would
+    serve a stale checkpoint and fork the thread from it. It is therefore opt-in.
+
+    Args:
+        saver: The wrapped saver, whose serializer is used to encode the cached
+            checkpoints.
+        cache: The cache of checkpoints.
+    """
+
+    def __init__(self, saver: BaseCheckpointSaver, cache: CheckpointCache) -> None:
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.cache = cache
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        key = self.__key(config)
+        checkpoint_id = get_checkpoint_id(config)
+
+        entry = self.cache.get(key)
+        if entry is not None and checkpoint_id in (None, entry.checkpoint_id):
+            return self.__to_tuple(key, entry)
+
+        generation = self.cache.generation
+        checkpoint_tuple = await self.saver.aget_tuple(config)
+        if (
+            checkpoint_tuple is not None
+            and checkpoint_id is None
+            and not checkpoint_tuple.pending_writes
+        ):
+            parent_config = checkpoint_tuple.parent_config
+            self.cache.put(
+                key,
+                self.__to_entry(
+                    checkpoint_tuple.checkpoint,
+                    checkpoint_tuple.metadata,
+                    get_checkpoint_id(parent_config) if parent_config else None,
+                ),
+                generation=generation,
+            )
+
+        return checkpoint_tuple
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        async for checkpoint_tuple in self.saver.alist(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        invalidations = self.cache.invalidations
+        next_config = await self.saver.aput(config, checkpoint, metadata, new_versions)
+        self.cache.put(
+            self.__key(config),
+            self.__to_entry(checkpoint, metadata, get_checkpoint_id(config)),
+            invalidations=invalidations,
+        )
+
+        return next_config
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.cache.discard(self.__key(config))
+        await self.saver.aput_writes(config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        self.cache.invalidate_thread(thread_id)
+        await self.saver.adelete_thread(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.saver.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        self.cache.discard(self.__key(config))
+        return self.saver.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.cache.discard(self.__key(config))
+        self.saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.cache.invalidate_thread(thread_id)
+        self.saver.delete_thread(thread_id)
+
+    def __to_entry(
+        self,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        parent_checkpoint_id: Optional[str],
+    ) -> CachedCheckpoint:
+        type_, data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+
+        return CachedCheckpoint(
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=parent_checkpoint_id,
+            type=type_,
+            checkpoint=data,
+            metadata_type=metadata_type,
+            metadata=metadata_data,
+        )
+
+    def __to_tuple(self, key: ThreadKey, entry: CachedCheckpoint) -> CheckpointTuple:
+        thread_id, checkpoint_ns = key
+        parent_config = (
+            {
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": entry.parent_checkpoint_id,
+                }
+            }
+            if entry.parent_checkpoint_id
+            else None
+        )
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": entry.checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((entry.type, entry.checkpoint)),
+            metadata=self.serde.loads_typed((entry.metadata_type, entry.metadata)),
+            parent_config=parent_config,
+            pending_writes=[],
+        )
+
+    @staticmethod
+    def __key(config: RunnableConfig) -> ThreadKey:
+        configurable = config["configurable"]
+
+        return configurable["thread_id"], configurable.get("checkpoint_ns", "")
+
+
+# Global checkpoint cache instance
+checkpoint_cache = CheckpointCache(
+    max_bytes=settings.CHECKPOINT_CACHE_MAX_BYTES,
+    ttl_seconds=settings.CHECKPOINT_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,126 @@
+import zlib
+from typing import Any, Literal, Optional
+
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from loguru import logger
+
+from philoagents.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard is an optional dependency
+    zstandard = None
+
+Codec = Literal["zlib", "zstd"]
+
+# Header of the compressed payloads: magic bytes, format version and codec ID.
+MAGIC = b"PAC"
+FORMAT_VERSION = 1
+CODEC_IDS: dict[str, int] = {"zlib": 1, "zstd": 2}
+HEADER_SIZE = len(MAGIC) + 2
+
+# Serialization types whose payload is compressed. Raw "bytes" payloads are left as is,
+# as they could start with the magic bytes.
+COMPRESSED_TYPES = frozenset({"msgpack", "json", "pickle"})
+
+
+class CompressedSerializer(SerializerProtocol):
+    """Checkpoint serializer compressing the payloads of another serializer.
+
+    Payloads of at least `min_size` bytes are compressed with the codec, zlib if zstd
+    is selected but the `zstandard` package isn't installed, and prefixed with a header
+    holding magic bytes, the format version and the codec. The serialization type is
+    left unchanged. Payloads without the header are passed as is to the wrapped
+    serializer, so checkpoints stored before compression was enabled stay readable,
+    and so do payloads of either codec.
+
+    Args:
+        serde: The serializer producing the payloads, msgpack by default.
+        codec: The compression codec. Payloads are only decompressed if None.
+        level: The compression level.
+        min_size: Smallest payload compressed, in bytes.
+    """
+
+    def __init__(
+        self,
+        serde: SerializerProtocol | None = None,
+        codec: Optional[Codec] = "zstd",
+        level: int = 3,
+        min_size: int = 256,
+    ) -> None:
+        if codec == "zstd" and zstandard is None:
+            logger.warning(
+                "zstandard isn't installed, compressing checkpoints with zlib."
+            )
+            codec = "zlib"
+
+        self.serde = serde or JsonPlusSerializer()
+        self.codec = codec
+        self.level = level
+        self.min_size = min_size
+        self._header = (
+            MAGIC + bytes([FORMAT_VERSION, CODEC_IDS[codec]]) if codec else b""
+        )
+
+        if zstandard is not None:
+            self._zstd_compressor = zstandard.ZstdCompressor(level=level)
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+
+    def dumps_typed(self, obj: Any) -> tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if (
+            self.codec is None
+            or type_ not in COMPRESSED_TYPES
+            or len(data) < self.min_size
+        ):
+            return type_, data
+
+        return type_, self._header + self.__compress(data)
+
+    def loads_typed(self, data: tuple[str, bytes]) -> Any:
+        type_, payload = data
+        if type_ in COMPRESSED_TYPES and payload[: len(MAGIC)] == MAGIC:
+            payload = self.__decompress(payload)
+
+        return self.serde.loads_typed((type_, payload))
+
+    def __compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return self._zstd_compressor.compress(data)
+
+        return zlib.compress(data, min(self.level, 9))
+
+    def __decompress(self, payload: bytes) -> bytes:
+        version, codec_id = payload[len(MAGIC)], payload[len(MAGIC) + 1]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format version: {version}")
+
+        body = payload[HEADER_SIZE:]
+        if codec_id == CODEC_IDS["zlib"]:
+            return zlib.decompress(body)
+        if codec_id == CODEC_IDS["zstd"]:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this checkpoint.")
+            return self._zstd_decompressor.decompress(body)
+
+        raise ValueError(f"Unknown checkpoint compression codec: {codec_id}")
+
+
+def configure_checkpoint_serializer(checkpointer: Any) -> None:
+    """Sets the serializer selected in the settings on a checkpointer.
+
+    The MongoDB checkpointers ignore a `serde` passed to their constructor, so the
+    serializer is set on the instance. Their default serializer is wrapped, which keeps
+    the checkpoints written without compression readable. It is wrapped even when
+    compression is disabled, so checkpoints compressed earlier stay readable too.
+
+    Args:
+        checkpointer: The checkpointer to configure.
+    """
+    codec = settings.CHECKPOINT_COMPRESSION
+    checkpointer.serde = CompressedSerializer(
+        checkpointer.serde,
+        codec=None if codec == "none" else codec,
+        level=settings.CHECKPOINT_COMPRESSION_LEVEL,
+    )
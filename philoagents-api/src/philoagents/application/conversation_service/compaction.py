@@ -0,0 +1,237 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from langgraph.checkpoint.base.id import UUID
+from loguru import logger
+from pymongo.asynchronous.collection import AsyncCollection
+
+from philoagents.application.conversation_service.checkpoint_cache import (
+    checkpoint_cache,
+)
+from philoagents.application.conversation_service.runtime import conversation_runtime
+from philoagents.config import settings
+
+# Number of 100-ns intervals between the UUID epoch (1582-10-15) and the Unix epoch.
+UUID_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def checkpoint_timestamp(checkpoint_id: str) -> float:
+    """Gets the creation time of a checkpoint from its ID.
+
+    LangGraph checkpoint IDs are version 6 UUIDs, which embed their creation time and
+    sort in creation order.
+
+    Args:
+        checkpoint_id: The checkpoint ID.
+
+    Returns:
+        float: The creation time as a Unix timestamp.
+    """
+    return (UUID(checkpoint_id).time - UUID_EPOCH_OFFSET) / 1e7
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of a compaction of the conversation state collections."""
+
+    threads_scanned: int = 0
+    threads_compacted: int = 0
+    threads_expired: int = 0
+    checkpoints_deleted: int = 0
+    writes_deleted: int = 0
+    bytes_reclaimed: int = 0
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        """Convert the report to a dict."""
+        return asdict(self)
+
+
+class CheckpointCompactor:
+    """Applies a retention policy to the checkpoints of the conversation threads.
+
+    The checkpointer stores a new checkpoint, plus its writes, on every graph step and
+    never deletes them, while a turn only reads the latest one. The compactor keeps the
+    `keep_last` most recent checkpoints of every thread, with their writes, and deletes
+    the older ones. With `idle_ttl_seconds`, threads without a checkpoint for that long
+    are deleted entirely.
+
+    Deletions are bounded by checkpoint ID, so checkpoints written while a compaction
+    runs are never deleted. The reclaimed bytes are the BSON size of the deleted
+    documents; MongoDB reuses the space for new documents.
+
+    Args:
+        keep_last: Number of checkpoints kept per thread.
+        idle_ttl_seconds: Optional idle time after which a thread is deleted.
+        interval_seconds: Time between two compactions of the background job.
+    """
+
+    def __init__(
+        self,
+        keep_last: int,
+        idle_ttl_seconds: Optional[float] = None,
+        interval_seconds: float = 3600,
+    ) -> None:
+        if keep_last < 1:
+            raise ValueError("At least the latest checkpoint of a thread must be kept.")
+
+        self.keep_last = keep_last
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.interval_seconds = interval_seconds
+
+        self._task: Optional[asyncio.Task] = None
+        self.last_report: Optional[CompactionReport] = None
+        self.total_bytes_reclaimed = 0
+
+    def start(self) -> None:
+        """Start running compactions periodically on the running event loop."""
+        if self._task is not None:
+            return
+
+        self._task = asyncio.get_running_loop().create_task(self.__run_periodically())
+        logger.info(
+            f"Checkpoint compaction started | keep last: {self.keep_last} | "
+            f"idle TTL: {self.idle_ttl_seconds}s | interval: {self.interval_seconds}s"
+        )
+
+    async def close(self) -> None:
+        """Stop the periodic compactions."""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def compact(self) -> CompactionReport:
+        """Apply the retention policy to every conversation thread.
+
+        Returns:
+            CompactionReport: What was deleted and the bytes reclaimed.
+        """
+        start = time.perf_counter()
+        report = CompactionReport()
+
+        async with conversation_runtime.acquire_client() as client:
+            db = client[settings.MONGO_DB_NAME]
+            checkpoints = db[settings.MONGO_STATE_CHECKPOINT_COLLECTION]
+            writes = db[settings.MONGO_STATE_WRITES_COLLECTION]
+
+            idle_before = (
+                time.time() - self.idle_ttl_seconds
+                if self.idle_ttl_seconds is not None
+                else None
+            )
+            async for thread in await checkpoints.aggregate(
+                [
+                    {
+                        "$sort": {
+                            "thread_id": 1,
+                            "checkpoint_ns": 1,
+                            "checkpoint_id": -1,
+                        }
+                    },
+                    {
+                        "$group": {
+                            "_id": {
+                                "thread_id": "$thread_id",
+                                "checkpoint_ns": "$checkpoint_ns",
+                            },
+                            "count": {"$sum": 1},
+                            "latest": {"$first": "$checkpoint_id"},
+                        }
+                    },
+                ],
+                allowDiskUse=True,
+            ):
+                report.threads_scanned += 1
+                thread_filter = dict(thread["_id"])
+
+                if (
+                    idle_before is not None
+                    and checkpoint_timestamp(thread["latest"]) < idle_before
+                ):
+                    bound = {"$lte": thread["latest"]}
+                    report.threads_expired += 1
+                    checkpoint_cache.invalidate_thread(thread_filter["thread_id"])
+                elif thread["count"] > self.keep_last:
+                    oldest_kept = await checkpoints.find_one(
+                        thread_filter,
+                        {"checkpoint_id": 1},
+                        sort=[("checkpoint_id", -1)],
+                        skip=self.keep_last - 1,
+                    )
+                    bound = {"$lt": oldest_kept["checkpoint_id"]}
+                    report.threads_compacted += 1
+                else:
+                    continue
+
+                stale = {**thread_filter, "checkpoint_id": bound}
+                for collection in (checkpoints, writes):
+                    deleted, size = await self.__delete(collection, stale)
+                    report.bytes_reclaimed += size
+                    if collection is checkpoints:
+                        report.checkpoints_deleted += deleted
+                    else:
+                        report.writes_deleted += deleted
+
+        report.duration_seconds = time.perf_counter() - start
+        self.last_report = report
+        self.total_bytes_reclaimed += report.bytes_reclaimed
+        logger.info(f"Compacted conversation checkpoints | {report.to_dict()}")
+
+        return report
+
+    def stats(self) -> dict:
+        """Get the compaction metrics.
+
+        Returns:
+            dict: The retention policy, the last report and the total bytes reclaimed.
+        """
+        return {
+            "keep_last": self.keep_last,
+            "idle_ttl_seconds": self.idle_ttl_seconds,
+            "total_bytes_reclaimed": self.total_bytes_reclaimed,
+            "last_report": self.last_report.to_dict() if self.last_report else None,
+        }
+
+    @staticmethod
+    async def __delete(collection: AsyncCollection, query: dict) -> tuple[int, int]:
+        sizes = await (
+            await collection.aggregate(
+                [
+                    {"$match": query},
+                    {
+                        "$group": {
+                            "_id": None,
+                            "bytes": {"$sum": {"$bsonSize": "$$ROOT"}},
+                        }
+                    },
+                ]
+            )
+        ).to_list()
+        result = await collection.delete_many(query)
+
+        return result.deleted_count, sizes[0]["bytes"] if sizes else 0
+
+    async def __run_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.compact()
+            except Exception as e:
+                logger.error(f"Failed to compact conversation checkpoints: {e}")
+
+
+# Global checkpoint compactor instance
+checkpoint_compactor = CheckpointCompactor(
+    keep_last=settings.CHECKPOINT_RETENTION_KEEP_LAST,
+    idle_ttl_seconds=(
+        settings.CHECKPOINT_RETENTION_IDLE_TTL_DAYS * 86400
+        if settings.CHECKPOINT_RETENTION_IDLE_TTL_DAYS is not None
+        else None
+    ),
+    interval_seconds=settings.CHECKPOINT_COMPACTION_INTERVAL_MINUTES * 60,
+)
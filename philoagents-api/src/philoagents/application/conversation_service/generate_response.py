@@ -1,16 +1,29 @@
+import re
 import uuid
 from typing import Any, AsyncGenerator, Union, Optional
 
+import numpy as np
 from langchain_core.messages import AIMessage, AIMessageChunk, HumanMessage
-from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
-from opik.integrations.langchain import OpikTracer
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph.state import CompiledStateGraph
 
+from philoagents.application.conversation_service.admission import (
+    AdmissionRejectedError,
+    admission_controller,
+)
+from philoagents.application.conversation_service.response_cache import response_cache
+from philoagents.application.conversation_service.runtime import conversation_runtime
+from philoagents.application.conversation_service.scheduler import Priority
+from philoagents.application.conversation_service.summarizer import (
+    background_summarizer,
+)
 from philoagents.application.conversation_service.workflow.graph import (
-    create_workflow_graph,
+    get_workflow_graph_topology,
 )
 from philoagents.application.conversation_service.workflow.state import PhilosopherState
 from philoagents.application.session_service.session_manager import session_manager
 from philoagents.config import settings
+from philoagents.infrastructure.opik_utils import get_opik_tracer, trace_exporter
 
 
 async def get_response(
@@ -23,6 +36,7 @@ async def get_response(
     philosopher_context: str,
     user_id: Optional[str] = None,
     new_thread: bool = False,
+    priority: Priority = Priority.STANDARD,
 ) -> tuple[str, PhilosopherState]:
     """Run a conversation through the workflow graph.
 
@@ -36,6 +50,7 @@ async def get_response(
         philosopher_context: Additional context about the philosopher.
         user_id: Optional user identifier for session management.
         new_thread: Whether to create a new conversation thread.
+        priority: Priority class of the LLM calls of the turn.
 
     Returns:
         tuple[str, PhilosopherState]: A tuple containing:
@@ -43,22 +58,19 @@ async def get_response(
             - The final state after running the workflow.
 
     Raises:
+        AdmissionRejectedError: If the server is too busy to run the workflow.
         RuntimeError: If there's an error running the conversation workflow.
     """
     # Get or create user session
-    session = session_manager.get_or_create_session(user_id)
-
-    graph_builder = create_workflow_graph()
+    session = await session_manager.aget_or_create_session(user_id)
+    opik_tracer = None
 
     try:
-        async with AsyncMongoDBSaver.from_conn_string(
-            conn_string=settings.MONGO_URI,
-            db_name=settings.MONGO_DB_NAME,
-            checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
-            writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
-        ) as checkpointer:
-            graph = graph_builder.compile(checkpointer=checkpointer)
-            opik_tracer = OpikTracer(graph=graph.get_graph(xray=True))
+        async with (
+            admission_controller.admit(),
+            conversation_runtime.acquire_graph() as graph,
+        ):
+            opik_tracer = get_opik_tracer(get_workflow_graph_topology(graph.builder))
 
             # Create thread ID using user session and philosopher ID
             if new_thread:
@@ -66,24 +78,54 @@ async def get_response(
             else:
                 thread_id = session_manager.create_thread_id(session.user_id, philosopher_id)
             config = {
-                "configurable": {"thread_id": thread_id},
-                "callbacks": [opik_tracer],
-            }
-            output_state = await graph.ainvoke(
-                input={
-                    "messages": __format_messages(messages=messages),
-                    "philosopher_name": philosopher_name,
-                    "philosopher_perspective": philosopher_perspective,
-                    "philosopher_style": philosopher_style,
-                    "philosopher_greeting": philosopher_greeting or "",
-                    "philosopher_context": philosopher_context,
+                "configurable": {
+                    "thread_id": thread_id,
+                    "user_id": session.user_id,
+                    "priority": int(priority),
                 },
-                config=config,
-            )
+                "callbacks": [opik_tracer] if opik_tracer else [],
+            }
+            graph_input = {
+                "messages": __format_messages(messages=messages),
+                "philosopher_name": philosopher_name,
+                "philosopher_perspective": philosopher_perspective,
+                "philosopher_style": philosopher_style,
+                "philosopher_greeting": philosopher_greeting or "",
+                "philosopher_context": philosopher_context,
+            }
+            async with background_summarizer.thread_lock(thread_id):
+                query_embedding = await __get_cache_key(
+                    graph, config, messages, new_thread
+                )
+                cached_response = (
+                    response_cache.get(philosopher_id, query_embedding)
+                    if query_embedding is not None
+                    else None
+                )
+                if cached_response is not None:
+                    output_state = await __record_cached_turn(
+                        graph, config, graph_input, cached_response
+                    )
+                else:
+                    output_state = await graph.ainvoke(input=graph_input, config=config)
+                    if query_embedding is not None:
+                        response_cache.put(
+                            philosopher_id,
+                            query_embedding,
+                            output_state["messages"][-1].content,
+                        )
+        if len(output_state["messages"]) > settings.TOTAL_MESSAGES_SUMMARY_TRIGGER:
+            background_summarizer.schedule(thread_id)
+
         last_message = output_state["messages"][-1]
         return last_message.content, PhilosopherState(**output_state)
+    except AdmissionRejectedError:
+        raise
     except Exception as e:
         raise RuntimeError(f"Error running conversation workflow: {str(e)}") from e
+    finally:
+        if opik_tracer:
+            trace_exporter.request_flush()
 
 
 async def get_streaming_response(
@@ -96,6 +138,7 @@ async def get_streaming_response(
     philosopher_context: str,
     user_id: Optional[str] = None,
     new_thread: bool = False,
+    priority: Priority = Priority.STANDARD,
 ) -> AsyncGenerator[str, None]:
     """Run a conversation through the workflow graph with streaming response.
 
@@ -109,27 +152,25 @@ async def get_streaming_response(
         philosopher_context: Additional context about the philosopher.
         user_id: Optional user identifier for session management.
         new_thread: Whether to create a new conversation thread.
+        priority: Priority class of the LLM calls of the turn.
 
     Yields:
         Chunks of the response as they become available.
 
     Raises:
+        AdmissionRejectedError: If the server is too busy to run the workflow.
         RuntimeError: If there's an error running the conversation workflow.
     """
     # Get or create user session
-    session = session_manager.get_or_create_session(user_id)
-
-    graph_builder = create_workflow_graph()
+    session = await session_manager.aget_or_create_session(user_id)
+    opik_tracer = None
 
     try:
-        async with AsyncMongoDBSaver.from_conn_string(
-            conn_string=settings.MONGO_URI,
-            db_name=settings.MONGO_DB_NAME,
-            checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
-            writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
-        ) as checkpointer:
-            graph = graph_builder.compile(checkpointer=checkpointer)
-            opik_tracer = OpikTracer(graph=graph.get_graph(xray=True))
+        async with (
+            admission_controller.admit(),
+            conversation_runtime.acquire_graph() as graph,
+        ):
+            opik_tracer = get_opik_tracer(get_workflow_graph_topology(graph.builder))
 
             # Create thread ID using user session and philosopher ID
             if new_thread:
@@ -137,31 +178,115 @@ async def get_streaming_response(
             else:
                 thread_id = session_manager.create_thread_id(session.user_id, philosopher_id)
             config = {
-                "configurable": {"thread_id": thread_id},
-                "callbacks": [opik_tracer],
+                "configurable": {
+                    "thread_id": thread_id,
+                    "user_id": session.user_id,
+                    "priority": int(priority),
+                },
+                "callbacks": [opik_tracer] if opik_tracer else [],
             }
 
-            async for chunk in graph.astream(
-                input={
-                    "messages": __format_messages(messages=messages),
-                    "philosopher_name": philosopher_name,
-                    "philosopher_perspective": philosopher_perspective,
-                    "philosopher_style": philosopher_style,
-                    "philosopher_greeting": philosopher_greeting or "",
-                    "philosopher_context": philosopher_context,
-                },
-                config=config,
-                stream_mode="messages",
-            ):
-                if chunk[1]["langgraph_node"] == "conversation_node" and isinstance(
-                    chunk[0], AIMessageChunk
-                ):
-                    yield chunk[0].content
+            graph_input = {
+                "messages": __format_messages(messages=messages),
+                "philosopher_name": philosopher_name,
+                "philosopher_perspective": philosopher_perspective,
+                "philosopher_style": philosopher_style,
+                "philosopher_greeting": philosopher_greeting or "",
+                "philosopher_context": philosopher_context,
+            }
+            output_state = {}
+            async with background_summarizer.thread_lock(thread_id):
+                query_embedding = await __get_cache_key(
+                    graph, config, messages, new_thread
+                )
+                cached_response = (
+                    response_cache.get(philosopher_id, query_embedding)
+                    if query_embedding is not None
+                    else None
+                )
+                if cached_response is not None:
+                    output_state = await __record_cached_turn(
+                        graph, config, graph_input, cached_response
+                    )
+                    # Replay the cached answer word by word, like a model stream.
+                    for chunk in re.findall(r"\s*\S+", cached_response):
+                        yield chunk
+                else:
+                    async for stream_mode, chunk in graph.astream(
+                        input=graph_input,
+                        config=config,
+                        stream_mode=["messages", "values"],
+                    ):
+                        if stream_mode == "values":
+                            output_state = chunk
+                        elif chunk[1]["langgraph_node"] == "conversation_node" and isinstance(
+                            chunk[0], AIMessageChunk
+                        ):
+                            yield chunk[0].content
+
+                    if query_embedding is not None and output_state.get("messages"):
+                        response_cache.put(
+                            philosopher_id,
+                            query_embedding,
+                            output_state["messages"][-1].content,
+                        )
+
+        if len(output_state.get("messages", [])) > settings.TOTAL_MESSAGES_SUMMARY_TRIGGER:
+            background_summarizer.schedule(thread_id)
 
+    except AdmissionRejectedError:
+        raise
     except Exception as e:
         raise RuntimeError(
             f"Error running streaming conversation workflow: {str(e)}"
         ) from e
+    finally:
+        if opik_tracer:
+            trace_exporter.request_flush()
+
+
+async def __get_cache_key(
+    graph: CompiledStateGraph,
+    config: RunnableConfig,
+    messages: str | list[str] | list[dict[str, Any]],
+    new_thread: bool,
+) -> Optional[np.ndarray]:
+    """Get the response cache key of a turn, if the turn can be cached.
+
+    Only opening questions are cached: a single user message sent to an existing
+    thread that has no prior messages or summary.
+
+    Returns:
+        Optional[np.ndarray]: The query embedding, or None if the turn isn't cacheable.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or new_thread or not isinstance(messages, str):
+        return None
+
+    snapshot = await graph.aget_state(config)
+    if snapshot.values.get("messages") or snapshot.values.get("summary"):
+        return None
+
+    return await response_cache.embed(messages)
+
+
+async def __record_cached_turn(
+    graph: CompiledStateGraph,
+    config: RunnableConfig,
+    graph_input: dict[str, Any],
+    response: str,
+) -> dict[str, Any]:
+    """Write a turn answered from the cache to the thread, so the conversation can go on.
+
+    Returns:
+        dict[str, Any]: The state of the thread after the turn.
+    """
+    output_state = {
+        **graph_input,
+        "messages": [*graph_input["messages"], AIMessage(content=response)],
+    }
+    await graph.aupdate_state(config, output_state, as_node="connector_node")
+
+    return output_state
 
 
 def __format_messages(
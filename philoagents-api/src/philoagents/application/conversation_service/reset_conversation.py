@@ -1,9 +1,40 @@
-from typing import Optional
+import asyncio
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
 from loguru import logger
-from pymongo import MongoClient
 
+from philoagents.application.conversation_service.checkpoint_cache import (
+    checkpoint_cache,
+)
+from philoagents.application.conversation_service.runtime import conversation_runtime
 from philoagents.config import settings
 
+STATE_COLLECTIONS = (
+    settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+    settings.MONGO_STATE_WRITES_COLLECTION,
+)
+
+
+def user_thread_filter(user_id: str) -> dict:
+    """Builds the filter matching the conversation threads of a user.
+
+    Thread IDs are in format "user_id:philosopher_id", so the threads of a user are the
+    range of IDs starting with "user_id:". Unlike a regex, a range query is served by
+    the index on `thread_id` whatever the characters of the user ID.
+
+    Args:
+        user_id: The user identifier.
+
+    Returns:
+        dict: A MongoDB filter on `thread_id`.
+    """
+    # ";" is the character right after ":", so the range holds exactly the prefix.
+    return {"thread_id": {"$gte": f"{user_id}:", "$lt": f"{user_id};"}}
+
 
 async def reset_conversation_state(user_id: Optional[str] = None) -> dict:
     """Deletes conversation state data from MongoDB.
@@ -23,56 +54,20 @@ async def reset_conversation_state(user_id: Optional[str] = None) -> dict:
         Exception: If there's an error connecting to MongoDB or deleting data
     """
     try:
-        client = MongoClient(settings.MONGO_URI)
-        db = client[settings.MONGO_DB_NAME]
-
-        deleted_count = 0
-        collections_affected = []
-
-        if user_id:
-            # Delete only documents for the specific user
-            # Thread IDs are in format "user_id:philosopher_id"
-            thread_pattern = {"thread_id": {"$regex": f"^{user_id}:"}}
-
-            if settings.MONGO_STATE_CHECKPOINT_COLLECTION in db.list_collection_names():
-                checkpoint_collection = db[settings.MONGO_STATE_CHECKPOINT_COLLECTION]
-                result = checkpoint_collection.delete_many(thread_pattern)
-                deleted_count += result.deleted_count
-                if result.deleted_count > 0:
-                    collections_affected.append(f"{settings.MONGO_STATE_CHECKPOINT_COLLECTION} ({result.deleted_count} documents)")
-                logger.info(f"Deleted {result.deleted_count} checkpoint documents for user {user_id}")
-
-            if settings.MONGO_STATE_WRITES_COLLECTION in db.list_collection_names():
-                writes_collection = db[settings.MONGO_STATE_WRITES_COLLECTION]
-                result = writes_collection.delete_many(thread_pattern)
-                deleted_count += result.deleted_count
-                if result.deleted_count > 0:
-                    collections_affected.append(f"{settings.MONGO_STATE_WRITES_COLLECTION} ({result.deleted_count} documents)")
-                logger.info(f"Deleted {result.deleted_count} writes documents for user {user_id}")
-
-            message = f"Successfully deleted {deleted_count} documents for user {user_id}"
-            if collections_affected:
-                message += f" from: {', '.join(collections_affected)}"
-        else:
-            # Delete all collections (original behavior)
-            collections_deleted = []
-
-            if settings.MONGO_STATE_CHECKPOINT_COLLECTION in db.list_collection_names():
-                db.drop_collection(settings.MONGO_STATE_CHECKPOINT_COLLECTION)
-                collections_deleted.append(settings.MONGO_STATE_CHECKPOINT_COLLECTION)
-                logger.info(f"Deleted collection: {settings.MONGO_STATE_CHECKPOINT_COLLECTION}")
-
-            if settings.MONGO_STATE_WRITES_COLLECTION in db.list_collection_names():
-                db.drop_collection(settings.MONGO_STATE_WRITES_COLLECTION)
-                collections_deleted.append(settings.MONGO_STATE_WRITES_COLLECTION)
-                logger.info(f"Deleted collection: {settings.MONGO_STATE_WRITES_COLLECTION}")
-
-            if collections_deleted:
-                message = f"Successfully deleted collections: {', '.join(collections_deleted)}"
+        async with conversation_runtime.acquire_client() as client:
+            db = client[settings.MONGO_DB_NAME]
+
+            if user_id:
+                prefix = f"{user_id}:"
+                await conversation_runtime.discard_pending_checkpoints(
+                    lambda thread_id: thread_id.startswith(prefix)
+                )
+                message = await __delete_user_threads(db, user_id)
+                checkpoint_cache.invalidate_user(user_id)
             else:
-                message = "No collections needed to be deleted"
-
-        client.close()
+                await conversation_runtime.discard_pending_checkpoints(lambda _: True)
+                message = await __drop_state_collections(db)
+                checkpoint_cache.clear()
 
         return {
             "status": "success",
@@ -82,3 +77,128 @@ async def reset_conversation_state(user_id: Optional[str] = None) -> dict:
     except Exception as e:
         logger.error(f"Failed to reset conversation state: {str(e)}")
         raise Exception(f"Failed to reset conversation state: {str(e)}")
+
+
+async def __delete_user_threads(db, user_id: str) -> str:
+    thread_filter = user_thread_filter(user_id)
+    results = await asyncio.gather(
+        *(db[name].delete_many(thread_filter) for name in STATE_COLLECTIONS)
+    )
+
+    deleted_count = 0
+    collections_affected = []
+    for name, result in zip(STATE_COLLECTIONS, results):
+        deleted_count += result.deleted_count
+        if result.deleted_count > 0:
+            collections_affected.append(f"{name} ({result.deleted_count} documents)")
+        logger.info(f"Deleted {result.deleted_count} documents from {name} for user {user_id}")
+
+    message = f"Successfully deleted {deleted_count} documents for user {user_id}"
+    if collections_affected:
+        message += f" from: {', '.join(collections_affected)}"
+
+    return message
+
+
+async def __drop_state_collections(db) -> str:
+    existing = set(await db.list_collection_names())
+    collections_deleted = [name for name in STATE_COLLECTIONS if name in existing]
+    for name in collections_deleted:
+        await db.drop_collection(name)
+        logger.info(f"Deleted collection: {name}")
+
+    await conversation_runtime.recreate_indexes()
+
+    if collections_deleted:
+        return f"Successfully deleted collections: {', '.join(collections_deleted)}"
+
+    return "No collections needed to be deleted"
+
+
+@dataclass
+class ResetJob:
+    """A reset of all conversations running in the background."""
+
+    job_id: str
+    status: Literal["running", "succeeded", "failed"] = "running"
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert the job to a JSON serializable dict."""
+        job = asdict(self)
+        job["created_at"] = self.created_at.isoformat()
+        job["finished_at"] = self.finished_at.isoformat() if self.finished_at else None
+
+        return job
+
+
+class ResetJobRegistry:
+    """Runs resets of all conversations as background jobs and tracks their status.
+
+    At most one reset runs at a time: starting a reset while one is running returns the
+    running job. Only the `max_jobs` most recent jobs are kept.
+
+    Args:
+        max_jobs: Maximum number of jobs whose status is kept.
+    """
+
+    def __init__(self, max_jobs: int = 100) -> None:
+        self.max_jobs = max_jobs
+
+        self._jobs: OrderedDict[str, ResetJob] = OrderedDict()
+        self._running: Optional[tuple[ResetJob, asyncio.Task]] = None
+
+    def start(self) -> ResetJob:
+        """Start a reset of all conversations, unless one is already running.
+
+        Returns:
+            ResetJob: The started or running job.
+        """
+        if self._running is not None:
+            return self._running[0]
+
+        job = ResetJob(job_id=str(uuid.uuid4()))
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+        task = asyncio.create_task(self.__run(job))
+        self._running = (job, task)
+        logger.info(f"Started conversation reset job {job.job_id}")
+
+        return job
+
+    def get(self, job_id: str) -> Optional[ResetJob]:
+        """Get a job by its ID, if it is still tracked."""
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        """Cancel the running job, if any, and wait for it to stop."""
+        if self._running is None:
+            return
+
+        _, task = self._running
+        task.cancel()
+        await asyncio.wait([task])
+
+    async def __run(self, job: ResetJob) -> None:
+        try:
+            job.result = await reset_conversation_state()
+            job.status = "succeeded"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._running = None
+
+
+# Global reset job registry instance
+reset_jobs = ResetJobRegistry()
@@ -0,0 +1,183 @@
+import asyncio
+import itertools
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from philoagents.application.conversation_service.workflow.tools import retriever
+from philoagents.config import settings
+
+
+@dataclass
+class CachedResponse:
+    """A philosopher's answer to the opening question of a conversation."""
+
+    philosopher_id: str
+    embedding: np.ndarray
+    response: str
+    expires_at: float
+
+
+class SemanticResponseCache:
+    """Caches first-turn answers per philosopher, keyed by the query embedding.
+
+    A lookup hits when a cached question for the same philosopher has a cosine
+    similarity with the new question of at least `similarity_threshold`. Entries
+    expire after `ttl_seconds` and the least recently used ones are evicted once
+    `max_entries` is reached.
+
+    Args:
+        embedding_model: The model used to embed the questions.
+        similarity_threshold: Minimum cosine similarity for a cache hit.
+        ttl_seconds: Seconds an entry stays valid.
+        max_entries: Maximum number of cached answers.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        similarity_threshold: float,
+        ttl_seconds: float,
+        max_entries: int,
+    ) -> None:
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[int, CachedResponse] = OrderedDict()
+        self._keys_by_philosopher: dict[str, list[int]] = {}
+        self._matrices: dict[str, np.ndarray] = {}
+        self._key_counter = itertools.count()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def embed(self, query: str) -> np.ndarray:
+        """Embed and L2-normalize a query off the event loop.
+
+        Args:
+            query: The user question.
+
+        Returns:
+            np.ndarray: The normalized float32 query embedding.
+        """
+        embedding = await asyncio.to_thread(self.embedding_model.embed_query, query)
+        embedding = np.asarray(embedding, dtype=np.float32)
+
+        return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+    def get(self, philosopher_id: str, embedding: np.ndarray) -> Optional[str]:
+        """Look up the answer to the most similar cached question.
+
+        Args:
+            philosopher_id: The philosopher being asked.
+            embedding: The normalized query embedding returned by `embed`.
+
+        Returns:
+            Optional[str]: The cached answer on a hit, None on a miss.
+        """
+        self.__evict_expired(philosopher_id)
+
+        keys = self._keys_by_philosopher.get(philosopher_id)
+        if not keys:
+            self.misses += 1
+            return None
+
+        matrix = self._matrices.get(philosopher_id)
+        if matrix is None:
+            matrix = np.stack([self._entries[key].embedding for key in keys])
+            self._matrices[philosopher_id] = matrix
+
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            self.misses += 1
+            return None
+
+        key = keys[best]
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        return self._entries[key].response
+
+    def put(self, philosopher_id: str, embedding: np.ndarray, response: str) -> None:
+        """Cache the answer to an opening question.
+
+        Args:
+            philosopher_id: The philosopher who answered.
+            embedding: The normalized query embedding returned by `embed`.
+            response: The philosopher's answer.
+        """
+        if not response:
+            return
+
+        key = next(self._key_counter)
+        self._entries[key] = CachedResponse(
+            philosopher_id=philosopher_id,
+            embedding=embedding,
+            response=response,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._keys_by_philosopher.setdefault(philosopher_id, []).append(key)
+        self._matrices.pop(philosopher_id, None)
+
+        while len(self._entries) > self.max_entries:
+            oldest_key = next(iter(self._entries))
+            self.__remove(oldest_key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all cached answers."""
+        self._entries.clear()
+        self._keys_by_philosopher.clear()
+        self._matrices.clear()
+
+    def stats(self) -> dict:
+        """Get the cache metrics.
+
+        Returns:
+            dict: Hits, misses, hit rate, evictions and current size.
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+    def __evict_expired(self, philosopher_id: str) -> None:
+        now = time.monotonic()
+        expired = [
+            key
+            for key in self._keys_by_philosopher.get(philosopher_id, [])
+            if self._entries[key].expires_at <= now
+        ]
+        for key in expired:
+            self.__remove(key)
+            self.evictions += 1
+
+    def __remove(self, key: int) -> None:
+        entry = self._entries.pop(key)
+        keys = self._keys_by_philosopher[entry.philosopher_id]
+        keys.remove(key)
+        if not keys:
+            del self._keys_by_philosopher[entry.philosopher_id]
+        self._matrices.pop(entry.philosopher_id, None)
+
+
+# Global semantic response cache instance
+response_cache = SemanticResponseCache(
+    embedding_model=retriever.vectorstore.embeddings,
+    similarity_threshold=settings.RESPONSE_CACHE_SIMILARITY_THRESHOLD,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+)
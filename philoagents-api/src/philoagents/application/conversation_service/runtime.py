@@ -0,0 +1,207 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional
+
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from langgraph.graph.state import CompiledStateGraph
+from loguru import logger
+from pymongo import AsyncMongoClient
+
+from philoagents.application.conversation_service.checkpoint_cache import (
+    CachedCheckpointSaver,
+    checkpoint_cache,
+)
+from philoagents.application.conversation_service.checkpoint_serializer import (
+    configure_checkpoint_serializer,
+)
+from philoagents.application.conversation_service.workflow.graph import (
+    create_workflow_graph,
+)
+from philoagents.application.conversation_service.write_behind import (
+    WriteBehindCheckpointSaver,
+)
+from philoagents.config import settings
+from philoagents.infrastructure.mongo import MongoIndex
+
+
+class ConversationRuntime:
+    """Process-wide holder for the MongoDB checkpointer and the compiled workflow graph.
+
+    The runtime is started once from the FastAPI lifespan and bound to the event loop of
+    the server, so every chat turn reuses the same connection pool and compiled graph.
+    Callers running on a different event loop (e.g., CLI tools or evaluation jobs that use
+    `asyncio.run`) transparently fall back to a short-lived checkpointer.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[AsyncMongoClient] = None
+        self._checkpointer: Optional[AsyncMongoDBSaver] = None
+        self._write_behind: Optional[WriteBehindCheckpointSaver] = None
+        self._graph: Optional[CompiledStateGraph] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the runtime has been started and not yet closed."""
+        return self._graph is not None
+
+    @property
+    def client(self) -> Optional[AsyncMongoClient]:
+        """The shared async MongoDB client, if the runtime is started."""
+        return self._client
+
+    @property
+    def checkpointer(self) -> Optional[AsyncMongoDBSaver]:
+        """The shared checkpointer, if the runtime is started."""
+        return self._checkpointer
+
+    async def start(self) -> None:
+        """Open the shared MongoDB connection pool and compile the workflow graph."""
+        if self.is_started:
+            return
+
+        self._client = AsyncMongoClient(settings.MONGO_URI, appname="philoagents")
+        await self._client.admin.command("ping")
+        if settings.MONGO_PROVISION_INDEXES:
+            await MongoIndex.provision(self._client[settings.MONGO_DB_NAME])
+
+        self._checkpointer = AsyncMongoDBSaver(
+            self._client,
+            db_name=settings.MONGO_DB_NAME,
+            checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+            writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
+        )
+        configure_checkpoint_serializer(self._checkpointer)
+        saver = self._checkpointer
+        if settings.CHECKPOINT_DURABILITY == "async":
+            self._write_behind = WriteBehindCheckpointSaver(
+                self._checkpointer,
+                flush_interval_ms=settings.CHECKPOINT_WRITE_BEHIND_FLUSH_INTERVAL_MS,
+                batch_size=settings.CHECKPOINT_WRITE_BEHIND_BATCH_SIZE,
+                max_backlog=settings.CHECKPOINT_WRITE_BEHIND_MAX_BACKLOG,
+            )
+            await self._write_behind.start()
+            saver = self._write_behind
+        if settings.CHECKPOINT_CACHE_ENABLED:
+            saver = CachedCheckpointSaver(saver, checkpoint_cache)
+        self._graph = create_workflow_graph(
+            defer_summarization=settings.SUMMARIZATION_MODE == "deferred",
+            speculative_retrieval=settings.RAG_SPECULATIVE_RETRIEVAL,
+        ).compile(checkpointer=saver)
+        self._loop = asyncio.get_running_loop()
+
+        logger.info("Conversation runtime started.")
+
+    async def close(self) -> None:
+        """Release the compiled graph and close the shared MongoDB connection pool.
+
+        Pending checkpoints of the write-behind queue are stored before the pool closes.
+        """
+        self._graph = None
+        if self._write_behind is not None:
+            await self._write_behind.close()
+            self._write_behind = None
+        self._checkpointer = None
+        self._loop = None
+
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+        logger.info("Conversation runtime closed.")
+
+    @asynccontextmanager
+    async def acquire_graph(self) -> AsyncIterator[CompiledStateGraph]:
+        """Yield a compiled workflow graph backed by the MongoDB checkpointer.
+
+        Yields:
+            CompiledStateGraph: The shared graph when the runtime is started on the
+                current event loop, otherwise a graph compiled against a short-lived
+                checkpointer that is closed on exit.
+        """
+        if self.__is_usable():
+            yield self._graph
+            return
+
+        async with AsyncMongoDBSaver.from_conn_string(
+            conn_string=settings.MONGO_URI,
+            db_name=settings.MONGO_DB_NAME,
+            checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+            writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
+        ) as checkpointer:
+            configure_checkpoint_serializer(checkpointer)
+            yield create_workflow_graph(
+                speculative_retrieval=settings.RAG_SPECULATIVE_RETRIEVAL,
+            ).compile(checkpointer=checkpointer)
+
+    async def recreate_indexes(self) -> None:
+        """Recreate the checkpointer indexes, e.g., after its collections were dropped.
+
+        The checkpointer only creates its indexes on first use, so it must be told to
+        create them again. Does nothing if the runtime isn't usable on this event loop.
+        """
+        if not self.__is_usable():
+            return
+
+        if settings.MONGO_PROVISION_INDEXES:
+            await MongoIndex.provision(self._client[settings.MONGO_DB_NAME])
+        self._checkpointer._setup_future = None
+        await self._checkpointer._setup()
+
+    async def discard_pending_checkpoints(
+        self, predicate: Callable[[str], bool]
+    ) -> int:
+        """Drop the checkpoints of the matching threads not yet stored by write-behind.
+
+        Must be called before deleting threads, so their queued checkpoints don't
+        recreate them. Does nothing if the runtime isn't usable on this event loop or
+        checkpoints are stored synchronously.
+
+        Args:
+            predicate: Returns True for the thread IDs whose checkpoints are dropped.
+
+        Returns:
+            int: Number of dropped operations.
+        """
+        if not self.__is_usable() or self._write_behind is None:
+            return 0
+
+        return await self._write_behind.discard(predicate)
+
+    def write_behind_stats(self) -> Optional[dict]:
+        """Get the write-behind metrics, if checkpoints are stored asynchronously."""
+        if self._write_behind is None:
+            return None
+
+        return self._write_behind.stats()
+
+    @asynccontextmanager
+    async def acquire_client(self) -> AsyncIterator[AsyncMongoClient]:
+        """Yield an async MongoDB client.
+
+        Yields:
+            AsyncMongoClient: The shared client when the runtime is started on the
+                current event loop, otherwise a short-lived client that is closed on exit.
+        """
+        if self.__is_usable():
+            yield self._client
+            return
+
+        client = AsyncMongoClient(settings.MONGO_URI, appname="philoagents")
+        try:
+            yield client
+        finally:
+            await client.close()
+
+    def __is_usable(self) -> bool:
+        if not self.is_started:
+            return False
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+# Global conversation runtime instance
+conversation_runtime = ConversationRuntime()
@@ -0,0 +1,215 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import AsyncIterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from loguru import logger
+
+from philoagents.config import settings
+from philoagents.infrastructure.metrics import LATENCY_BUCKETS_SECONDS, Histogram
+
+
+class Priority(IntEnum):
+    """Priority classes of the LLM work, from the most to the least latency sensitive."""
+
+    INTERACTIVE = 0
+    STANDARD = 1
+    BACKGROUND = 2
+    BATCH = 3
+
+
+PRIORITY_WEIGHTS = {
+    Priority.INTERACTIVE: 8,
+    Priority.STANDARD: 4,
+    Priority.BACKGROUND: 2,
+    Priority.BATCH: 1,
+}
+
+
+class LLMScheduler:
+    """Weighted fair scheduler for the LLM calls of the process.
+
+    At most `max_concurrency` LLM calls run at once. Once saturated, calls are queued
+    per flow, a flow being a (priority, user) pair, and dispatched with start-time fair
+    queuing: every flow gets a share of the capacity proportional to the weight of its
+    priority class, and flows of the same class get equal shares. A busy user or a
+    batch job can't starve the other flows, while interactive turns get the largest
+    share under contention.
+
+    Like the conversation runtime, the scheduler is bound to the event loop of the
+    server; calls made on other event loops are not scheduled.
+
+    Args:
+        max_concurrency: Maximum number of concurrent LLM calls.
+        weights: Weight of each priority class.
+    """
+
+    MAX_TRACKED_FLOWS = 10_000
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        weights: dict[Priority, float] = PRIORITY_WEIGHTS,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.weights = weights
+
+        self._running = 0
+        self._queue: list[tuple[float, int, asyncio.Future, Priority]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags: dict[tuple[Priority, Optional[str]], float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._queued = {priority: 0 for priority in Priority}
+        self._dispatched = {priority: 0 for priority in Priority}
+        self._wait_seconds = {
+            priority: Histogram(LATENCY_BUCKETS_SECONDS) for priority in Priority
+        }
+
+    def start(self) -> None:
+        """Bind the scheduler to the running event loop."""
+        self._loop = asyncio.get_running_loop()
+
+        logger.info(f"LLM scheduler started | max concurrency: {self.max_concurrency}")
+
+    def close(self) -> None:
+        """Unbind the scheduler from its event loop."""
+        self._loop = None
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority = Priority.STANDARD, user_id: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Hold an LLM call slot for the duration of the context.
+
+        Args:
+            priority: The priority class of the call.
+            user_id: The user the call is made for. Calls without user share a flow.
+        """
+        if not self.__is_usable():
+            yield
+            return
+
+        await self.__acquire(Priority(priority), user_id)
+        try:
+            yield
+        finally:
+            self.__release()
+
+    @asynccontextmanager
+    async def slot_for(self, config: Optional[RunnableConfig]) -> AsyncIterator[None]:
+        """Hold an LLM call slot for the priority and user set in a runnable config.
+
+        Args:
+            config: The config of the graph run, with optional `priority` and `user_id`
+                configurable fields.
+        """
+        configurable = (config or {}).get("configurable", {})
+        async with self.slot(
+            priority=configurable.get("priority", Priority.STANDARD),
+            user_id=configurable.get("user_id"),
+        ):
+            yield
+
+    def stats(self) -> dict:
+        """Get the scheduler metrics.
+
+        Returns:
+            dict: The running calls, and per priority class the queued and dispatched
+                calls and the wait time histogram.
+        """
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "classes": {
+                priority.name.lower(): {
+                    "queued": self._queued[priority],
+                    "dispatched": self._dispatched[priority],
+                    "wait_seconds": self._wait_seconds[priority].snapshot(),
+                }
+                for priority in Priority
+            },
+        }
+
+    async def __acquire(self, priority: Priority, user_id: Optional[str]) -> None:
+        flow = (priority, user_id)
+        if len(self._finish_tags) > self.MAX_TRACKED_FLOWS:
+            self.__prune_flows()
+        start_tag = max(self._virtual_time, self._finish_tags.get(flow, 0.0))
+        self._finish_tags[flow] = start_tag + 1 / self.weights[priority]
+
+        if self._running < self.max_concurrency and not self._queue:
+            self._running += 1
+            self._virtual_time = start_tag
+            self.__record_dispatch(priority, 0)
+            return
+
+        waiter = self._loop.create_future()
+        entry = (start_tag, next(self._sequence), waiter, priority)
+        heapq.heappush(self._queue, entry)
+        self._queued[priority] += 1
+        start = time.monotonic()
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right as the wait was interrupted.
+                self.__release()
+            else:
+                waiter.cancel()
+                # A release may have already dropped the entry once it was cancelled.
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    self._queued[priority] -= 1
+            raise
+
+        self.__record_dispatch(priority, time.monotonic() - start)
+
+    def __release(self) -> None:
+        # Hand the slot over to the queued call with the smallest start tag, if any,
+        # skipping the calls cancelled while queued.
+        while self._queue:
+            start_tag, _, waiter, priority = heapq.heappop(self._queue)
+            self._queued[priority] -= 1
+            if waiter.done():
+                continue
+
+            self._virtual_time = start_tag
+            waiter.set_result(None)
+            return
+
+        self._running -= 1
+        if self._running == 0:
+            # Every flow is idle, so none of them has service to catch up on.
+            self._finish_tags.clear()
+
+    def __prune_flows(self) -> None:
+        # Flows whose finish tag is behind the virtual time start from it anyway.
+        self._finish_tags = {
+            flow: finish_tag
+            for flow, finish_tag in self._finish_tags.items()
+            if finish_tag > self._virtual_time
+        }
+
+    def __record_dispatch(self, priority: Priority, wait_seconds: float) -> None:
+        self._dispatched[priority] += 1
+        self._wait_seconds[priority].observe(wait_seconds)
+
+    def __is_usable(self) -> bool:
+        if self._loop is None:
+            return False
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+# Global LLM scheduler instance
+llm_scheduler = LLMScheduler(max_concurrency=settings.LLM_SCHEDULER_MAX_CONCURRENCY)
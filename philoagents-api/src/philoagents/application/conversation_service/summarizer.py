@@ -0,0 +1,208 @@
+import asyncio
+import weakref
+from contextlib import AbstractAsyncContextManager, nullcontext
+from typing import Optional
+
+from langchain_core.messages import RemoveMessage
+from loguru import logger
+
+from philoagents.application.conversation_service.runtime import conversation_runtime
+from philoagents.application.conversation_service.scheduler import (
+    Priority,
+    llm_scheduler,
+)
+from philoagents.application.conversation_service.workflow.chains import (
+    get_conversation_summary_chain,
+)
+from philoagents.config import settings
+
+
+class BackgroundSummarizer:
+    """Summarizes long conversations in a pool of background workers.
+
+    Used when `SUMMARIZATION_MODE` is "deferred": the turn is answered right away and
+    the thread is queued here. A worker summarizes a snapshot of the conversation and
+    then applies the new summary plus the `RemoveMessage` deletions to the thread's
+    latest checkpoint. Turns and summary updates on the same thread are serialized
+    through a per-thread lock, and only messages from the snapshot that still exist
+    are removed, so messages sent mid-summary are never lost.
+
+    Args:
+        workers: Number of concurrent summarization workers.
+        max_queue_size: Maximum number of threads waiting to be summarized.
+    """
+
+    def __init__(self, workers: int, max_queue_size: int) -> None:
+        self._workers = workers
+        self._max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: list[asyncio.Task] = []
+        self._pending: set[str] = set()
+        self._thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker pool is running on the current event loop."""
+        if not self._tasks:
+            return False
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    async def start(self) -> None:
+        """Start the worker pool on the running event loop."""
+        if self._tasks:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._tasks = [
+            self._loop.create_task(self.__worker()) for _ in range(self._workers)
+        ]
+        logger.info(f"Background summarizer started with {self._workers} workers.")
+
+    async def close(self, timeout: float = 30.0) -> None:
+        """Wait for queued summaries to finish, then stop the worker pool.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain.
+        """
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Dropping {self._queue.qsize()} pending conversation summaries on shutdown."
+            )
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+        self._loop = None
+
+    def thread_lock(self, thread_id: str) -> AbstractAsyncContextManager:
+        """Get the lock serializing graph runs and summary updates of a thread.
+
+        Args:
+            thread_id: The conversation thread identifier.
+
+        Returns:
+            AbstractAsyncContextManager: The lock shared by everyone currently using
+                the thread, or a no-op context when the summarizer isn't running.
+        """
+        if not self.is_running:
+            return nullcontext()
+
+        lock = self._thread_locks.get(thread_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._thread_locks[thread_id] = lock
+
+        return lock
+
+    def schedule(self, thread_id: str) -> bool:
+        """Queue a thread for summarization unless it is already queued.
+
+        Args:
+            thread_id: The conversation thread identifier.
+
+        Returns:
+            bool: True if the thread is queued or being summarized, False if the
+                summarizer isn't running or its queue is full.
+        """
+        if not self.is_running:
+            return False
+
+        if thread_id in self._pending:
+            return True
+
+        try:
+            self._queue.put_nowait(thread_id)
+        except asyncio.QueueFull:
+            # The thread is rescheduled on its next turn, as it is still too long.
+            logger.warning(f"Summarization queue is full. Skipping thread {thread_id}.")
+            return False
+
+        self._pending.add(thread_id)
+
+        return True
+
+    async def __worker(self) -> None:
+        while True:
+            thread_id = await self._queue.get()
+            try:
+                await self.__summarize(thread_id)
+            except Exception as e:
+                logger.error(f"Failed to summarize conversation {thread_id}: {e}")
+            finally:
+                self._pending.discard(thread_id)
+                self._queue.task_done()
+
+    async def __summarize(self, thread_id: str) -> None:
+        config = {"configurable": {"thread_id": thread_id}}
+
+        async with conversation_runtime.acquire_graph() as graph:
+            snapshot = await graph.aget_state(config)
+            messages = snapshot.values.get("messages", [])
+            if len(messages) <= settings.TOTAL_MESSAGES_SUMMARY_TRIGGER:
+                return
+
+            summary = snapshot.values.get("summary", "")
+            summary_chain = get_conversation_summary_chain(summary)
+            async with llm_scheduler.slot(
+                Priority.BACKGROUND, user_id=thread_id.split(":", 1)[0]
+            ):
+                response = await summary_chain.ainvoke(
+                    {
+                        "messages": messages,
+                        "philosopher_name": snapshot.values["philosopher_name"],
+                        "summary": summary,
+                    }
+                )
+            summarized_ids = [
+                m.id for m in messages[: -settings.TOTAL_MESSAGES_AFTER_SUMMARY]
+            ]
+
+            async with self.thread_lock(thread_id):
+                # Re-read the thread, as turns may have been added (or the thread
+                # reset) while the summary was being generated.
+                current = await graph.aget_state(config)
+                if current.values.get("summary", "") != summary:
+                    return
+
+                current_ids = {m.id for m in current.values.get("messages", [])}
+                delete_messages = [
+                    RemoveMessage(id=message_id)
+                    for message_id in summarized_ids
+                    if message_id in current_ids
+                ]
+                if not delete_messages:
+                    return
+
+                await graph.aupdate_state(
+                    config,
+                    {"summary": response.content, "messages": delete_messages},
+                    as_node="connector_node",
+                )
+
+        logger.info(
+            f"Summarized conversation {thread_id} and removed {len(delete_messages)} messages."
+        )
+
+
+# Global background summarizer instance
+background_summarizer = BackgroundSummarizer(
+    workers=settings.SUMMARIZATION_WORKERS,
+    max_queue_size=settings.SUMMARIZATION_QUEUE_SIZE,
+)
@@ -1,5 +1,13 @@
+import asyncio
+from functools import lru_cache
+from typing import Callable, Hashable, Optional
+
+import groq
+import httpx
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import Runnable
 from langchain_groq import ChatGroq
+from loguru import logger
 
 from philoagents.application.conversation_service.workflow.tools import tools
 from philoagents.config import settings
@@ -13,22 +21,124 @@ from pydantic import SecretStr
 
 
 def get_chat_model(temperature: float = 0.6, top_p: float = 0.95,
-    model_name: str = settings.GROQ_LLM_MODEL) -> ChatGroq:
+    model_name: str = settings.GROQ_LLM_MODEL,
+    http_async_client: Optional[httpx.AsyncClient] = None) -> ChatGroq:
     model_kwargs = {"top_p": top_p}
     return ChatGroq(
         api_key=SecretStr(settings.GROQ_API_KEY),
         model=model_name,
         temperature=temperature,
         model_kwargs=model_kwargs,
+        http_async_client=http_async_client,
     )
 
 
-def get_philosopher_response_chain():
-    model = get_chat_model()
-    model = model.bind_tools(tools)
+class ChainRegistry:
+    """Builds each chain once and shares a pooled, keep-alive HTTP client across them.
+
+    The registry is started from the FastAPI lifespan and bound to the server's event
+    loop. Callers on any other event loop get freshly built chains, since pooled
+    connections can't be shared across event loops.
+    """
+
+    def __init__(self) -> None:
+        self._chains: dict[Hashable, Runnable] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> None:
+        """Open the pooled HTTP client used by every chain built by the registry."""
+        if self._http_client is not None:
+            return
+
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.GROQ_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.GROQ_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.GROQ_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        self._loop = asyncio.get_running_loop()
+
+    async def warm_up(self) -> None:
+        """Pre-open a connection (DNS, TCP and TLS) to the LLM provider.
+
+        Gives up after `GROQ_WARM_UP_TIMEOUT_SECONDS`, so an unreachable provider
+        doesn't hold up the server startup.
+        """
+        if self._http_client is None:
+            return
+
+        try:
+            client = groq.AsyncGroq(
+                api_key=settings.GROQ_API_KEY,
+                http_client=self._http_client,
+                max_retries=0,
+            )
+            async with asyncio.timeout(settings.GROQ_WARM_UP_TIMEOUT_SECONDS):
+                await client.models.list()
+            logger.info("LLM provider connection warmed up.")
+        except TimeoutError:
+            logger.warning(
+                "Timed out warming up the LLM provider connection after "
+                f"{settings.GROQ_WARM_UP_TIMEOUT_SECONDS}s."
+            )
+        except Exception as e:
+            logger.warning(f"Failed to warm up the LLM provider connection: {e}")
+
+    async def close(self) -> None:
+        """Drop the cached chains and close the pooled HTTP client."""
+        self._chains.clear()
+        self._loop = None
+
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    def get(
+        self,
+        key: Hashable,
+        build: Callable[[Optional[httpx.AsyncClient]], Runnable],
+    ) -> Runnable:
+        """Return the chain registered under `key`, building it on first use.
+
+        Args:
+            key: Identifies the chain, e.g. (name, model, temperature, variant).
+            build: Builds the chain given the HTTP client its model should use.
+
+        Returns:
+            Runnable: The cached chain, or a freshly built one when the registry
+                isn't started on the current event loop.
+        """
+        if not self.__is_usable():
+            return build(None)
+
+        chain = self._chains.get(key)
+        if chain is None:
+            chain = build(self._http_client)
+            self._chains[key] = chain
+
+        return chain
+
+    def __is_usable(self) -> bool:
+        if self._http_client is None:
+            return False
+
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+# Global chain registry instance
+chain_registry = ChainRegistry()
+
+
+@lru_cache(maxsize=1)
+def get_philosopher_response_prompt() -> ChatPromptTemplate:
     system_message = PHILOSOPHER_CHARACTER_CARD
 
-    prompt = ChatPromptTemplate.from_messages(
+    return ChatPromptTemplate.from_messages(
         [
             ("system", system_message.prompt),
             MessagesPlaceholder(variable_name="messages"),
@@ -36,15 +146,12 @@ def get_philosopher_response_chain():
         template_format="jinja2",
     )
 
-    return prompt | model
-
 
-def get_conversation_summary_chain(summary: str = ""):
-    model = get_chat_model(model_name=settings.GROQ_LLM_MODEL_CONTEXT_SUMMARY)
+@lru_cache(maxsize=2)
+def get_conversation_summary_prompt(extend: bool) -> ChatPromptTemplate:
+    summary_message = EXTEND_SUMMARY_PROMPT if extend else SUMMARY_PROMPT
 
-    summary_message = EXTEND_SUMMARY_PROMPT if summary else SUMMARY_PROMPT
-
-    prompt = ChatPromptTemplate.from_messages(
+    return ChatPromptTemplate.from_messages(
         [
             MessagesPlaceholder(variable_name="messages"),
             ("human", summary_message.prompt),
@@ -52,16 +159,68 @@ def get_conversation_summary_chain(summary: str = ""):
         template_format="jinja2",
     )
 
-    return prompt | model
-
 
-def get_context_summary_chain():
-    model = get_chat_model(model_name=settings.GROQ_LLM_MODEL_CONTEXT_SUMMARY)
-    prompt = ChatPromptTemplate.from_messages(
+@lru_cache(maxsize=1)
+def get_context_summary_prompt() -> ChatPromptTemplate:
+    return ChatPromptTemplate.from_messages(
         [
             ("human", CONTEXT_SUMMARY_PROMPT.prompt),
         ],
         template_format="jinja2",
     )
 
-    return prompt | model
\ No newline at end of file
+
+def get_philosopher_response_chain():
+    model_name = settings.GROQ_LLM_MODEL
+    temperature = 0.6
+
+    def build(http_async_client: Optional[httpx.AsyncClient]) -> Runnable:
+        model = get_chat_model(
+            temperature=temperature,
+            model_name=model_name,
+            http_async_client=http_async_client,
+        )
+        model = model.bind_tools(tools)
+
+        return get_philosopher_response_prompt() | model
+
+    return chain_registry.get(
+        ("philosopher_response", model_name, temperature, None), build
+    )
+
+
+def get_conversation_summary_chain(summary: str = ""):
+    model_name = settings.GROQ_LLM_MODEL_CONTEXT_SUMMARY
+    temperature = 0.6
+    extend = bool(summary)
+
+    def build(http_async_client: Optional[httpx.AsyncClient]) -> Runnable:
+        model = get_chat_model(
+            temperature=temperature,
+            model_name=model_name,
+            http_async_client=http_async_client,
+        )
+
+        return get_conversation_summary_prompt(extend) | model
+
+    return chain_registry.get(
+        ("conversation_summary", model_name, temperature, extend), build
+    )
+
+
+def get_context_summary_chain():
+    model_name = settings.GROQ_LLM_MODEL_CONTEXT_SUMMARY
+    temperature = 0.6
+
+    def build(http_async_client: Optional[httpx.AsyncClient]) -> Runnable:
+        model = get_chat_model(
+            temperature=temperature,
+            model_name=model_name,
+            http_async_client=http_async_client,
+        )
+
+        return get_context_summary_prompt() | model
+
+    return chain_registry.get(
+        ("context_summary", model_name, temperature, None), build
+    )
@@ -1,5 +1,6 @@
 from typing_extensions import Literal
 
+from langchain_core.messages import AIMessage, ToolMessage
 from langgraph.graph import END
 
 from philoagents.application.conversation_service.workflow.state import PhilosopherState
@@ -15,3 +16,20 @@ def should_summarize_conversation(
         return "summarize_conversation_node"
 
     return END
+
+
+def route_conversation(
+    state: PhilosopherState,
+) -> Literal[
+    "retrieve_philosopher_context", "summarize_context_node", "connector_node"
+]:
+    last_message = state["messages"][-1]
+
+    # The speculative retrieval already answered the tool call.
+    if isinstance(last_message, ToolMessage):
+        return "summarize_context_node"
+
+    if isinstance(last_message, AIMessage) and last_message.tool_calls:
+        return "retrieve_philosopher_context"
+
+    return "connector_node"
@@ -1,13 +1,16 @@
 from functools import lru_cache
 
+from langchain_core.runnables.graph import Graph
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import tools_condition
 
 from philoagents.application.conversation_service.workflow.edges import (
+    route_conversation,
     should_summarize_conversation,
 )
 from philoagents.application.conversation_service.workflow.nodes import (
     conversation_node,
+    speculative_conversation_node,
     summarize_conversation_node,
     retriever_node,
     summarize_context_node,
@@ -16,33 +19,55 @@ from philoagents.application.conversation_service.workflow.nodes import (
 from philoagents.application.conversation_service.workflow.state import PhilosopherState
 
 
-@lru_cache(maxsize=1)
-def create_workflow_graph():
+@lru_cache(maxsize=4)
+def create_workflow_graph(
+    defer_summarization: bool = False, speculative_retrieval: bool = False
+):
     graph_builder = StateGraph(PhilosopherState)
 
     # Add all nodes
-    graph_builder.add_node("conversation_node", conversation_node)
+    if speculative_retrieval:
+        graph_builder.add_node("conversation_node", speculative_conversation_node)
+    else:
+        graph_builder.add_node("conversation_node", conversation_node)
     graph_builder.add_node("retrieve_philosopher_context", retriever_node)
-    graph_builder.add_node("summarize_conversation_node", summarize_conversation_node)
     graph_builder.add_node("summarize_context_node", summarize_context_node)
     graph_builder.add_node("connector_node", connector_node)
     
     # Define the flow
     graph_builder.add_edge(START, "conversation_node")
-    graph_builder.add_conditional_edges(
-        "conversation_node",
-        tools_condition,
-        {
-            "tools": "retrieve_philosopher_context",
-            END: "connector_node"
-        }
-    )
+    if speculative_retrieval:
+        graph_builder.add_conditional_edges("conversation_node", route_conversation)
+    else:
+        graph_builder.add_conditional_edges(
+            "conversation_node",
+            tools_condition,
+            {
+                "tools": "retrieve_philosopher_context",
+                END: "connector_node"
+            }
+        )
     graph_builder.add_edge("retrieve_philosopher_context", "summarize_context_node")
     graph_builder.add_edge("summarize_context_node", "conversation_node")
-    graph_builder.add_conditional_edges("connector_node", should_summarize_conversation)
-    graph_builder.add_edge("summarize_conversation_node", END)
+    if defer_summarization:
+        # Summarization runs in background workers after the turn has been answered.
+        graph_builder.add_edge("connector_node", END)
+    else:
+        graph_builder.add_node("summarize_conversation_node", summarize_conversation_node)
+        graph_builder.add_conditional_edges("connector_node", should_summarize_conversation)
+        graph_builder.add_edge("summarize_conversation_node", END)
     
     return graph_builder
 
 # Compiled without a checkpointer. Used for LangGraph Studio
 graph = create_workflow_graph().compile()
+
+
+@lru_cache(maxsize=4)
+def get_workflow_graph_topology(graph_builder: StateGraph) -> Graph:
+    """Returns the xray topology of a workflow graph, computed once per graph variant.
+
+    Args:
+        graph_builder: The builder of the graph, as returned by `create_workflow_graph`.
+    """
+    return graph_builder.compile().get_graph(xray=True)
@@ -1,14 +1,22 @@
-from langchain_core.messages import RemoveMessage
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import ToolNode
+from loguru import logger
 
+from philoagents.application.conversation_service.scheduler import llm_scheduler
 from philoagents.application.conversation_service.workflow.chains import (
     get_context_summary_chain,
     get_conversation_summary_chain,
     get_philosopher_response_chain,
 )
 from philoagents.application.conversation_service.workflow.state import PhilosopherState
-from philoagents.application.conversation_service.workflow.tools import tools
+from philoagents.application.conversation_service.workflow.tools import (
+    context_compressor,
+    retriever_tool,
+    tools,
+)
 from philoagents.config import settings
 
 retriever_node = ToolNode(tools)
@@ -18,33 +26,75 @@ async def conversation_node(state: PhilosopherState, config: RunnableConfig):
     summary = state.get("summary", "")
     conversation_chain = get_philosopher_response_chain()
 
-    response = await conversation_chain.ainvoke(
-        {
-            "messages": state["messages"],
-            "philosopher_context": state["philosopher_context"],
-            "philosopher_name": state["philosopher_name"],
-            "philosopher_perspective": state["philosopher_perspective"],
-            "philosopher_style": state["philosopher_style"],
-            "philosopher_greeting": state["philosopher_greeting"],
-            "summary": summary,
-        },
-        config,
-    )
+    async with llm_scheduler.slot_for(config):
+        response = await conversation_chain.ainvoke(
+            {
+                "messages": state["messages"],
+                "philosopher_context": state["philosopher_context"],
+                "philosopher_name": state["philosopher_name"],
+                "philosopher_perspective": state["philosopher_perspective"],
+                "philosopher_style": state["philosopher_style"],
+                "philosopher_greeting": state["philosopher_greeting"],
+                "summary": summary,
+            },
+            config,
+        )
     
     return {"messages": response}
 
 
-async def summarize_conversation_node(state: PhilosopherState):
+async def speculative_conversation_node(state: PhilosopherState, config: RunnableConfig):
+    last_message = state["messages"][-1]
+    if not isinstance(last_message, HumanMessage):
+        return await conversation_node(state, config)
+
+    # Search for the user message while the model decides whether it needs context.
+    retrieval = asyncio.create_task(
+        retriever_tool.ainvoke({"query": last_message.content}, config)
+    )
+    retrieval.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    try:
+        output = await conversation_node(state, config)
+    except BaseException:
+        retrieval.cancel()
+        raise
+
+    response = output["messages"]
+    tool_calls = response.tool_calls
+    if len(tool_calls) != 1 or tool_calls[0]["name"] != retriever_tool.name:
+        retrieval.cancel()
+
+        return output
+
+    try:
+        context = await retrieval
+    except Exception as e:
+        logger.warning(f"Speculative retrieval failed. Retrieving again: {e}")
+
+        return output
+
+    tool_message = ToolMessage(
+        content=context,
+        name=retriever_tool.name,
+        tool_call_id=tool_calls[0]["id"],
+    )
+
+    return {"messages": [response, tool_message]}
+
+
+async def summarize_conversation_node(state: PhilosopherState, config: RunnableConfig):
     summary = state.get("summary", "")
     summary_chain = get_conversation_summary_chain(summary)
 
-    response = await summary_chain.ainvoke(
-        {
-            "messages": state["messages"],
-            "philosopher_name": state["philosopher_name"],
-            "summary": summary,
-        }
-    )
+    async with llm_scheduler.slot_for(config):
+        response = await summary_chain.ainvoke(
+            {
+                "messages": state["messages"],
+                "philosopher_name": state["philosopher_name"],
+                "summary": summary,
+            }
+        )
 
     delete_messages = [
         RemoveMessage(id=m.id)
@@ -53,18 +103,42 @@ async def summarize_conversation_node(state: PhilosopherState):
     return {"summary": response.content, "messages": delete_messages}
 
 
-async def summarize_context_node(state: PhilosopherState):
+async def summarize_context_node(state: PhilosopherState, config: RunnableConfig):
+    if settings.RAG_CONTEXT_COMPRESSION == "extractive":
+        state["messages"][-1].content = await asyncio.to_thread(
+            context_compressor,
+            __get_retrieval_query(state),
+            state["messages"][-1].content,
+        )
+
+        return {}
+
     context_summary_chain = get_context_summary_chain()
 
-    response = await context_summary_chain.ainvoke(
-        {
-            "context": state["messages"][-1].content,
-        }
-    )
+    async with llm_scheduler.slot_for(config):
+        response = await context_summary_chain.ainvoke(
+            {
+                "context": state["messages"][-1].content,
+            }
+        )
     state["messages"][-1].content = response.content
 
     return {}
 
 
 async def connector_node(state: PhilosopherState):
-    return {}
\ No newline at end of file
+    return {}
+
+
+def __get_retrieval_query(state: PhilosopherState) -> str:
+    """Returns the query the model searched for, falling back to the last user message."""
+    tool_message = state["messages"][-1]
+    for message in reversed(state["messages"][:-1]):
+        if isinstance(message, AIMessage):
+            for tool_call in message.tool_calls:
+                if tool_call["id"] == tool_message.tool_call_id:
+                    return tool_call["args"].get("query", "")
+        if isinstance(message, HumanMessage):
+            return message.content
+
+    return ""
\ No newline at end of file
@@ -1,6 +1,7 @@
 from langchain.tools.retriever import create_retriever_tool
 
-from philoagents.application.rag.retrievers import get_retriever
+from philoagents.application.rag.compressors import get_context_compressor
+from philoagents.application.rag.retrievers import get_cached_retriever, get_retriever
 from philoagents.config import settings
 
 retriever = get_retriever(
@@ -9,9 +10,14 @@ retriever = get_retriever(
     device=settings.RAG_DEVICE)
 
 retriever_tool = create_retriever_tool(
-    retriever,
+    get_cached_retriever(retriever),
     "retrieve_philosopher_context",
     "Search and return information about a specific philosopher. Always use this tool when the user asks you about a philosopher, their works, ideas or historical context.",
 )
 
-tools = [retriever_tool]
\ No newline at end of file
+tools = [retriever_tool]
+
+context_compressor = get_context_compressor(
+    embedding_model=retriever.vectorstore.embeddings,
+    token_budget=settings.RAG_CONTEXT_TOKEN_BUDGET,
+)
@@ -0,0 +1,429 @@
+import asyncio
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+from langgraph.checkpoint.mongodb.utils import dumps_metadata
+from loguru import logger
+from pymongo import UpdateOne
+
+from philoagents.infrastructure.metrics import (
+    LATENCY_BUCKETS_SECONDS,
+    SIZE_BUCKETS,
+    Histogram,
+)
+
+# A pending operation: whether it targets the writes collection, and the operation.
+PendingOperation = tuple[bool, UpdateOne]
+
+
+class CheckpointFlushError(Exception):
+    """Raised when a thread is read while its queued operations can't be flushed."""
+
+
+class WriteBehindCheckpointSaver(BaseCheckpointSaver):
+    """MongoDB checkpoint saver persisting checkpoints in the background.
+
+    Checkpoints and writes are serialized right away, exactly as the wrapped saver would
+    store them, then queued per thread instead of being written before the graph moves
+    on. A background task flushes the queues with one ordered `bulk_write` per
+    collection every `flush_interval_ms`, or as soon as `batch_size` operations are
+    pending. Writes are flushed before checkpoints, so a flushed checkpoint always has
+    the writes of its parent.
+
+    Reads of a thread first flush its queue, so the graph always reads its own writes.
+    If that flush fails, the read raises `CheckpointFlushError` rather than returning a
+    stale checkpoint the graph would then branch from.
+    Once `max_backlog` operations are pending, new checkpoints wait for a flush. On
+    close, the queues are drained; operations still pending after `drain_timeout_seconds`
+    are lost, as they would be on a crash.
+
+    Args:
+        saver: The wrapped MongoDB saver, providing the collections and serializer.
+        flush_interval_ms: Maximum time an operation stays queued.
+        batch_size: Number of pending operations triggering a flush.
+        max_backlog: Number of pending operations above which writers wait.
+        drain_timeout_seconds: Maximum time spent draining the queues on close.
+    """
+
+    def __init__(
+        self,
+        saver: AsyncMongoDBSaver,
+        flush_interval_ms: float = 100,
+        batch_size: int = 500,
+        max_backlog: int = 10_000,
+        drain_timeout_seconds: float = 30,
+    ) -> None:
+        super().__init__(serde=saver.serde)
+        self.saver = saver
+        self.flush_interval_ms = flush_interval_ms
+        self.batch_size = batch_size
+        self.max_backlog = max_backlog
+        self.drain_timeout_seconds = drain_timeout_seconds
+
+        self._queues: OrderedDict[str, deque[PendingOperation]] = OrderedDict()
+        self._backlog = 0
+        self._flushing: dict[str, asyncio.Future] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.flushes = 0
+        self.flushed_operations = 0
+        self.failed_flushes = 0
+        self.flush_size = Histogram(SIZE_BUCKETS)
+        self.flush_seconds = Histogram(LATENCY_BUCKETS_SECONDS)
+
+    @property
+    def backlog(self) -> int:
+        """Number of operations waiting to be flushed."""
+        return self._backlog
+
+    async def start(self) -> None:
+        """Create the indexes and start flushing on the running event loop."""
+        await self.saver._setup()
+        self._task = asyncio.get_running_loop().create_task(self.__flush_periodically())
+
+        logger.info(
+            f"Checkpoint write-behind started | flush interval: {self.flush_interval_ms}ms"
+        )
+
+    async def close(self) -> None:
+        """Stop the background flushes and drain the queues."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        try:
+            async with asyncio.timeout(self.drain_timeout_seconds):
+                while self._backlog:
+                    if not await self.flush():
+                        await asyncio.sleep(self.flush_interval_ms / 1000)
+        except TimeoutError:
+            logger.error(f"Dropping {self._backlog} pending checkpoint operations.")
+
+        logger.info("Checkpoint write-behind closed.")
+
+    async def flush(self, thread_id: Optional[str] = None) -> bool:
+        """Write the queued operations to MongoDB.
+
+        Threads being flushed by another call are waited for, so the operations of a
+        thread are always written in order.
+
+        Args:
+            thread_id: Only flush the operations of this thread, if set.
+
+        Returns:
+            bool: False if the flush failed, in which case the operations stay queued.
+        """
+        threads = list(self._queues) if thread_id is None else [thread_id]
+        await self.__wait_for_flushes(threads)
+
+        batches = {
+            thread: self._queues.pop(thread)
+            for thread in threads
+            if thread in self._queues
+        }
+        if not batches:
+            return True
+
+        operations = [operation for batch in batches.values() for operation in batch]
+        self._backlog -= len(operations)
+        flushed = asyncio.get_running_loop().create_future()
+        for thread in batches:
+            self._flushing[thread] = flushed
+
+        start = asyncio.get_running_loop().time()
+        try:
+            # Operations are idempotent upserts, so a partly applied flush can be retried.
+            for is_write in (True, False):
+                requests = [
+                    request
+                    for to_writes, request in operations
+                    if to_writes is is_write
+                ]
+                if requests:
+                    collection = (
+                        self.saver.writes_collection
+                        if is_write
+                        else self.saver.checkpoint_collection
+                    )
+                    await collection.bulk_write(requests, ordered=True)
+        except BaseException as e:
+            # Requeue the operations ahead of the ones queued since, even if cancelled.
+            for thread, batch in reversed(batches.items()):
+                batch.extend(self._queues.pop(thread, ()))
+                self._queues[thread] = batch
+                self._queues.move_to_end(thread, last=False)
+            self._backlog += len(operations)
+            if not isinstance(e, Exception):
+                raise
+
+            self.failed_flushes += 1
+            logger.error(
+                f"Failed to flush {len(operations)} checkpoint operations: {e}"
+            )
+
+            return False
+        finally:
+            for thread in batches:
+                del self._flushing[thread]
+            flushed.set_result(None)
+
+        self.flushes += 1
+        self.flushed_operations += len(operations)
+        self.flush_size.observe(len(operations))
+        self.flush_seconds.observe(asyncio.get_running_loop().time() - start)
+
+        return True
+
+    async def discard(self, predicate: Callable[[str], bool]) -> int:
+        """Drop the queued operations of the threads matching a predicate.
+
+        Waits for the running flushes of these threads, so none of their operations is
+        written afterwards. Used before deleting threads.
+
+        Args:
+            predicate: Returns True for the thread IDs whose operations are dropped.
+
+        Returns:
+            int: Number of dropped operations.
+        """
+        await self.__wait_for_flushes(
+            [thread for thread in self._flushing if predicate(thread)]
+        )
+
+        dropped = 0
+        for thread in [thread for thread in self._queues if predicate(thread)]:
+            dropped += len(self._queues.pop(thread))
+        self._backlog -= dropped
+
+        return dropped
+
+    def stats(self) -> dict:
+        """Get the write-behind metrics.
+
+        Returns:
+            dict: The backlog, the flush counters and the flush size and time histograms.
+        """
+        return {
+            "backlog": self._backlog,
+            "threads": len(self._queues),
+            "flushing_threads": len(self._flushing),
+            "max_backlog": self.max_backlog,
+            "flushes": self.flushes,
+            "flushed_operations": self.flushed_operations,
+            "failed_flushes": self.failed_flushes,
+            "flush_size": self.flush_size.snapshot(),
+            "flush_seconds": self.flush_seconds.snapshot(),
+        }
+
+    @property
+    def config_specs(self) -> list:
+        return self.saver.config_specs
+
+    def get_next_version(self, current: Any, channel: None) -> Any:
+        return self.saver.get_next_version(current, channel)
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        await self.__flush_before_read(config["configurable"]["thread_id"])
+
+        return await self.saver.aget_tuple(config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        await self.__flush_before_read(
+            config["configurable"]["thread_id"] if config else None
+        )
+
+        async for checkpoint_tuple in self.saver.alist(
+            config, filter=filter, before=before, limit=limit
+        ):
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        # Mirrors AsyncMongoDBSaver.aput.
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint_id = checkpoint["id"]
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        doc = {
+            "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+            "type": type_,
+            "checkpoint": serialized_checkpoint,
+            "metadata": dumps_metadata(metadata),
+        }
+        if self.saver.ttl:
+            doc["created_at"] = datetime.now()
+        upsert_query = {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+        await self.__enqueue(
+            thread_id, [(False, UpdateOne(upsert_query, {"$set": doc}, upsert=True))]
+        )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        # Mirrors AsyncMongoDBSaver.aput_writes.
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        set_method = (
+            "$set" if all(w[0] in WRITES_IDX_MAP for w in writes) else "$setOnInsert"
+        )
+        operations = []
+        for idx, (channel, value) in enumerate(writes):
+            upsert_query = {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "task_path": task_path,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+            }
+            if self.saver.ttl:
+                upsert_query["created_at"] = datetime.now()
+            type_, serialized_value = self.serde.dumps_typed(value)
+            operations.append(
+                (
+                    True,
+                    UpdateOne(
+                        upsert_query,
+                        {
+                            set_method: {
+                                "channel": channel,
+                                "type": type_,
+                                "value": serialized_value,
+                            }
+                        },
+                        upsert=True,
+                    ),
+                )
+            )
+
+        await self.__enqueue(thread_id, operations)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await self.discard(lambda thread: thread == thread_id)
+        await self.saver.adelete_thread(thread_id)
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return self.saver.get_tuple(config)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        return self.saver.list(config, filter=filter, before=before, limit=limit)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return self.saver.put(config, checkpoint, metadata, new_versions)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        self.saver.put_writes(config, writes, task_id, task_path)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self.saver.delete_thread(thread_id)
+
+    async def __enqueue(
+        self, thread_id: str, operations: Sequence[PendingOperation]
+    ) -> None:
+        if not operations:
+            return
+
+        while self._backlog >= self.max_backlog:
+            # Apply backpressure instead of growing the queues without bound.
+            if not await self.flush():
+                await asyncio.sleep(self.flush_interval_ms / 1000)
+
+        queue = self._queues.get(thread_id)
+        if queue is None:
+            queue = self._queues[thread_id] = deque()
+        queue.extend(operations)
+        self._backlog += len(operations)
+
+        if self._backlog >= self.batch_size:
+            self._wakeup.set()
+
+    async def __flush_before_read(self, thread_id: Optional[str]) -> None:
+        if not await self.flush(thread_id):
+            # The queued operations are newer than what MongoDB holds for the thread.
+            raise CheckpointFlushError(
+                f"Pending checkpoint operations of thread '{thread_id}' couldn't be "
+                "flushed."
+                if thread_id is not None
+                else "Pending checkpoint operations couldn't be flushed."
+            )
+
+    async def __wait_for_flushes(self, threads: Sequence[str]) -> None:
+        while pending := {
+            self._flushing[thread] for thread in threads if thread in self._flushing
+        }:
+            await asyncio.wait(pending)
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.flush_interval_ms / 1000):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Checkpoint write-behind flush failed: {e}")
@@ -12,6 +12,7 @@ from opik.evaluation.metrics import (
 )
 
 from philoagents.application.conversation_service.generate_response import get_response
+from philoagents.application.conversation_service.scheduler import Priority
 from philoagents.application.conversation_service.workflow import state_to_str
 from philoagents.config import settings
 from philoagents.domain.philosopher_factory import PhilosopherFactory
@@ -48,6 +49,7 @@ async def evaluation_task(x: dict) -> dict:
         philosopher_style=philosopher.style,
         philosopher_context="",
         new_thread=True,
+        priority=Priority.BATCH,
     )
     context = state_to_str(latest_state)
 
@@ -2,7 +2,11 @@ from langchain_core.documents import Document
 from loguru import logger
 
 from philoagents.application.data import deduplicate_documents, get_extraction_generator
-from philoagents.application.rag.retrievers import Retriever, get_retriever
+from philoagents.application.rag.retrievers import (
+    IngestionGeneration,
+    Retriever,
+    get_retriever,
+)
 from philoagents.application.rag.splitters import Splitter, get_splitter
 from philoagents.config import settings
 from philoagents.domain.philosopher import PhilosopherExtract
@@ -47,6 +51,9 @@ class LongTermMemoryCreator:
 
         self.__create_index()
 
+        # Cached search results of every process point to the previous collection.
+        IngestionGeneration.from_retriever(self.retriever).bump()
+
     def __create_index(self) -> None:
         with MongoClientWrapper(
             model=Document, collection_name=settings.MONGO_LONG_TERM_MEMORY_COLLECTION
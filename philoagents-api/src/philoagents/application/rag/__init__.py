@@ -1,9 +1,14 @@
-from .embeddings import get_embedding_model
-from .retrievers import get_retriever
+from .compressors import get_context_compressor
+from .embeddings import get_embedding_cache_stats, get_embedding_model
+from .retrievers import get_cached_retriever, get_retriever, retrieval_cache
 from .splitters import get_splitter
 
 __all__ = [
     "get_retriever",
+    "get_cached_retriever",
+    "retrieval_cache",
     "get_splitter",
     "get_embedding_model",
+    "get_embedding_cache_stats",
+    "get_context_compressor",
 ]
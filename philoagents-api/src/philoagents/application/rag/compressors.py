@@ -0,0 +1,121 @@
+import re
+from functools import cached_property
+
+import numpy as np
+import tiktoken
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def get_context_compressor(
+    embedding_model: Embeddings, token_budget: int
+) -> "ExtractiveContextCompressor":
+    """Returns an extractive compressor for retrieved context.
+
+    Args:
+        embedding_model: The already loaded embedding model used by the retriever.
+        token_budget: Maximum number of tokens of the compressed context.
+
+    Returns:
+        ExtractiveContextCompressor: A compressor that keeps the sentences most
+            relevant to the query under the token budget.
+    """
+
+    logger.info(
+        f"Getting extractive context compressor with token budget: {token_budget}"
+    )
+
+    return ExtractiveContextCompressor(
+        embedding_model=embedding_model, token_budget=token_budget
+    )
+
+
+class ExtractiveContextCompressor:
+    """Compresses retrieved context by keeping the sentences most relevant to a query.
+
+    Sentences are scored by the cosine similarity between their embedding and the query
+    embedding, then picked greedily by score until the token budget is spent. Picked
+    sentences are returned in their original order, keeping the chunk boundaries.
+
+    Args:
+        embedding_model (Embeddings): The model used to embed the query and sentences.
+        token_budget (int): Maximum number of tokens of the compressed context.
+        encoding_name (str): The tiktoken encoding used to count tokens.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        token_budget: int,
+        encoding_name: str = "cl100k_base",
+    ) -> None:
+        self.embedding_model = embedding_model
+        self.token_budget = token_budget
+        self.encoding_name = encoding_name
+
+    @cached_property
+    def encoding(self) -> tiktoken.Encoding:
+        return tiktoken.get_encoding(self.encoding_name)
+
+    def __call__(self, query: str, context: str) -> str:
+        """Compress the context to the sentences most relevant to the query.
+
+        Args:
+            query (str): The query the context was retrieved for.
+            context (str): The retrieved context, with chunks separated by blank lines.
+
+        Returns:
+            str: The compressed context, or the original one if it fits the budget.
+        """
+        chunk_ids, sentences = self.__split(context)
+        if not sentences:
+            return context
+
+        token_counts = np.array(
+            [len(tokens) for tokens in self.encoding.encode_batch(sentences)]
+        )
+        if token_counts.sum() <= self.token_budget:
+            return context
+
+        scores = self.__score(query, sentences)
+
+        selected = []
+        remaining_budget = self.token_budget
+        for idx in np.argsort(-scores, kind="stable"):
+            if token_counts[idx] <= remaining_budget:
+                selected.append(idx)
+                remaining_budget -= token_counts[idx]
+
+        chunks: dict[int, list[str]] = {}
+        for idx in sorted(selected):
+            chunks.setdefault(chunk_ids[idx], []).append(sentences[idx])
+
+        return "\n\n".join(" ".join(chunk) for chunk in chunks.values())
+
+    def __split(self, context: str) -> tuple[list[int], list[str]]:
+        chunk_ids = []
+        sentences = []
+        for chunk_id, chunk in enumerate(re.split(r"\n\s*\n", context)):
+            for sentence in SENTENCE_BOUNDARY.split(chunk.strip()):
+                sentence = sentence.strip()
+                if sentence:
+                    chunk_ids.append(chunk_id)
+                    sentences.append(sentence)
+
+        return chunk_ids, sentences
+
+    def __score(self, query: str, sentences: list[str]) -> np.ndarray:
+        query_embedding = np.asarray(
+            self.embedding_model.embed_query(query), dtype=np.float32
+        )
+        sentence_embeddings = np.asarray(
+            self.embedding_model.embed_documents(sentences), dtype=np.float32
+        )
+
+        norms = np.linalg.norm(sentence_embeddings, axis=1) * np.linalg.norm(
+            query_embedding
+        )
+
+        return (sentence_embeddings @ query_embedding) / np.maximum(norms, 1e-12)
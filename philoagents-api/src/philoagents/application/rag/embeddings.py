@@ -1,6 +1,22 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
 from langchain_huggingface import HuggingFaceEmbeddings
+from loguru import logger
+
+from philoagents.config import settings
 
-EmbeddingsModel = HuggingFaceEmbeddings
+EmbeddingsModel = Embeddings
+
+# Embedding models loaded in the process, shared by every caller of the same model.
+_embedding_models: dict[tuple[str, str], EmbeddingsModel] = {}
+_embedding_models_lock = threading.Lock()
 
 
 def get_embedding_model(
@@ -9,6 +25,9 @@ def get_embedding_model(
 ) -> EmbeddingsModel:
     """Gets an instance of a HuggingFace embedding model.
 
+    The model is loaded once per process and, unless disabled in the settings, wrapped
+    with a memoizing cache so repeated texts are not re-encoded.
+
     Args:
         model_id (str): The ID/name of the HuggingFace embedding model to use
         device (str): The compute device to run the model on (e.g. "cpu", "cuda").
@@ -17,7 +36,37 @@ def get_embedding_model(
     Returns:
         EmbeddingsModel: A configured HuggingFace embeddings model instance
     """
-    return get_huggingface_embedding_model(model_id, device)
+    with _embedding_models_lock:
+        embedding_model = _embedding_models.get((model_id, device))
+        if embedding_model is not None:
+            return embedding_model
+
+        embedding_model = get_huggingface_embedding_model(model_id, device)
+        if settings.RAG_EMBEDDING_CACHE_ENABLED:
+            embedding_model = CachedEmbeddings(
+                embeddings=embedding_model,
+                namespace=model_id,
+                max_entries=settings.RAG_EMBEDDING_CACHE_MAX_ENTRIES,
+                cache_dir=settings.RAG_EMBEDDING_CACHE_DIR,
+                disk_slots=settings.RAG_EMBEDDING_CACHE_DISK_SLOTS,
+            )
+        _embedding_models[(model_id, device)] = embedding_model
+
+        return embedding_model
+
+
+def get_embedding_cache_stats() -> dict[str, dict]:
+    """Gets the metrics of every cached embedding model loaded in the process.
+
+    Returns:
+        dict[str, dict]: The cache metrics keyed by model ID.
+    """
+    with _embedding_models_lock:
+        return {
+            model_id: embedding_model.stats()
+            for (model_id, _), embedding_model in _embedding_models.items()
+            if isinstance(embedding_model, CachedEmbeddings)
+        }
 
 
 def get_huggingface_embedding_model(
@@ -38,3 +87,247 @@ def get_huggingface_embedding_model(
         model_kwargs={"device": device, "trust_remote_code": True},
         encode_kwargs={"normalize_embeddings": False},
     )
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that memoizes the vectors of already encoded texts.
+
+    Vectors live in a preallocated float32 array with one row per entry, and the rows
+    of the least recently used texts are recycled once `max_entries` is reached. When
+    `cache_dir` is set, vectors are also written to memory-mapped files acting as a
+    second tier that survives restarts.
+
+    Queries and documents are cached separately, since some models embed them
+    differently.
+
+    Args:
+        embeddings (Embeddings): The wrapped embedding model.
+        namespace (str): Identifies the wrapped model, e.g. its ID. Vectors of
+            different namespaces never mix on disk.
+        max_entries (int): Maximum number of vectors kept in memory.
+        cache_dir (Path, optional): Directory of the on-disk tier. Disabled if None.
+        disk_slots (int): Maximum number of vectors kept on disk.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        namespace: str,
+        max_entries: int,
+        cache_dir: Optional[Path] = None,
+        disk_slots: int = 100_000,
+    ) -> None:
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.max_entries = max_entries
+
+        self._slots: OrderedDict[bytes, int] = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+        self._disk: Optional[DiskEmbeddingStore] = None
+        if cache_dir is not None:
+            digest = hashlib.sha1(namespace.encode("utf-8")).hexdigest()[:16]
+            self._disk = DiskEmbeddingStore(Path(cache_dir) / digest, disk_slots)
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def embed_query(self, text: str) -> list[float]:
+        """Embed a query, reusing the cached vector if it was seen before.
+
+        Args:
+            text: The text to embed.
+
+        Returns:
+            list[float]: The embedding.
+        """
+        key = self.__key("query", text)
+        vector = self.__lookup(key)
+        if vector is None:
+            vector = np.asarray(self.embeddings.embed_query(text), dtype=np.float32)
+            self.__store(key, vector)
+
+        return vector.tolist()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embed documents, encoding only the texts that are not cached yet.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            list[list[float]]: One embedding per text.
+        """
+        keys = [self.__key("document", text) for text in texts]
+        vectors = [self.__lookup(key) for key in keys]
+
+        missing = [idx for idx, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = np.asarray(
+                self.embeddings.embed_documents([texts[idx] for idx in missing]),
+                dtype=np.float32,
+            )
+            for idx, vector in zip(missing, embedded):
+                self.__store(keys[idx], vector)
+                vectors[idx] = vector
+
+        return [vector.tolist() for vector in vectors]
+
+    def stats(self) -> dict:
+        """Get the cache metrics.
+
+        Returns:
+            dict: Memory hits, disk hits, misses, hit rate and the size of both tiers.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._slots),
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+        }
+
+    def __key(self, kind: str, text: str) -> bytes:
+        return hashlib.sha1(f"{kind}\0{text}".encode("utf-8")).digest()
+
+    def __lookup(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None:
+                self._slots.move_to_end(key)
+                self.hits += 1
+                return self._vectors[slot].copy()
+
+            vector = self._disk.get(key) if self._disk is not None else None
+            if vector is not None:
+                self.__put_in_memory(key, vector)
+                self.disk_hits += 1
+                return vector
+
+            self.misses += 1
+
+            return None
+
+    def __store(self, key: bytes, vector: np.ndarray) -> None:
+        with self._lock:
+            self.__put_in_memory(key, vector)
+            if self._disk is not None:
+                self._disk.put(key, vector)
+
+    def __put_in_memory(self, key: bytes, vector: np.ndarray) -> None:
+        if self._vectors is None:
+            self._vectors = np.empty(
+                (self.max_entries, vector.shape[0]), dtype=np.float32
+            )
+
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+        elif len(self._slots) < self.max_entries:
+            slot = len(self._slots)
+            self._slots[key] = slot
+        else:
+            _, slot = self._slots.popitem(last=False)
+            self._slots[key] = slot
+
+        self._vectors[slot] = vector
+
+
+class DiskEmbeddingStore:
+    """Ring buffer of embeddings backed by memory-mapped files.
+
+    The directory holds a `meta.json` file with the layout, then the SHA-1 keys, a
+    write sequence number and the float32 vector of every slot. Once full, the oldest
+    slot is overwritten. The files are created on the first write, when the dimension
+    of the vectors is known, and are meant to be written by a single process.
+
+    Args:
+        path (Path): The directory of the store.
+        slots (int): Number of vectors the store can hold.
+    """
+
+    KEY_SIZE = 20
+
+    def __init__(self, path: Path, slots: int) -> None:
+        self.path = path
+        self.slots = slots
+
+        self._index: dict[bytes, int] = {}
+        self._keys: Optional[np.memmap] = None
+        self._sequence: Optional[np.memmap] = None
+        self._vectors: Optional[np.memmap] = None
+        self._next_slot = 0
+        self._next_sequence = 1
+
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            try:
+                meta = json.loads(meta_path.read_text())
+                self.__open(meta["dim"], meta["slots"], mode="r+")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Ignoring unreadable embedding cache at '{path}': {e}")
+                self._index.clear()
+                self._vectors = None
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Get the vector stored under a key, if any."""
+        slot = self._index.get(key)
+        if slot is None:
+            return None
+
+        return np.array(self._vectors[slot])
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        """Store a vector, overwriting the oldest slot when the store is full."""
+        if self._vectors is None:
+            self.__create(vector.shape[0])
+        if key in self._index or vector.shape[0] != self._vectors.shape[1]:
+            return
+
+        slot = self._next_slot
+        if self._sequence[slot]:
+            self._index.pop(self._keys[slot].tobytes(), None)
+
+        self._vectors[slot] = vector
+        self._keys[slot] = np.frombuffer(key, dtype=np.uint8)
+        self._sequence[slot] = self._next_sequence
+        self._index[key] = slot
+
+        self._next_slot = (slot + 1) % len(self._sequence)
+        self._next_sequence += 1
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __create(self, dim: int) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.__open(dim, self.slots, mode="w+")
+        (self.path / "meta.json").write_text(
+            json.dumps({"dim": dim, "slots": self.slots})
+        )
+
+    def __open(self, dim: int, slots: int, mode: str) -> None:
+        self._keys = np.memmap(
+            self.path / "keys.u8",
+            dtype=np.uint8,
+            mode=mode,
+            shape=(slots, self.KEY_SIZE),
+        )
+        self._sequence = np.memmap(
+            self.path / "sequence.u64", dtype=np.uint64, mode=mode, shape=(slots,)
+        )
+        self._vectors = np.memmap(
+            self.path / "vectors.f32", dtype=np.float32, mode=mode, shape=(slots, dim)
+        )
+
+        for slot in np.flatnonzero(self._sequence):
+            self._index[self._keys[slot].tobytes()] = int(slot)
+
+        # Empty slots have a zero sequence, so writing resumes at the oldest slot.
+        self._next_slot = int(np.argmin(self._sequence))
+        self._next_sequence = int(self._sequence.max()) + 1
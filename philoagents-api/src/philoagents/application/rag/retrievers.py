@@ -1,17 +1,49 @@
-from langchain_huggingface import HuggingFaceEmbeddings
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain_mongodb.retrievers import (
     MongoDBAtlasHybridSearchRetriever,
 )
 from loguru import logger
+from pydantic import ConfigDict
+from pymongo.collection import Collection
 
 from philoagents.config import settings
+from philoagents.infrastructure.cache import TTLCache
 
-from .embeddings import get_embedding_model
+from .embeddings import EmbeddingsModel, get_embedding_model
 
 Retriever = MongoDBAtlasHybridSearchRetriever
 
 
+def documents_size(documents: list[Document]) -> int:
+    """Estimates the memory footprint of retrieved documents, in bytes."""
+    return sum(
+        len(doc.page_content.encode("utf-8")) + len(repr(doc.metadata))
+        for doc in documents
+    )
+
+
+# Keyed by the ingestion generation, so re-ingesting the long-term memory invalidates it.
+retrieval_cache: TTLCache[tuple[Optional[str], str, int], list[Document]] = TTLCache(
+    max_bytes=settings.RAG_RETRIEVAL_CACHE_MAX_BYTES,
+    ttl_seconds=settings.RAG_RETRIEVAL_CACHE_TTL_SECONDS,
+    max_entries=settings.RAG_RETRIEVAL_CACHE_MAX_ENTRIES,
+    sizeof=documents_size,
+)
+
+
 def get_retriever(
     embedding_model_id: str,
     k: int = 3,
@@ -37,12 +69,12 @@ def get_retriever(
 
 
 def get_hybrid_search_retriever(
-    embedding_model: HuggingFaceEmbeddings, k: int
+    embedding_model: EmbeddingsModel, k: int
 ) -> MongoDBAtlasHybridSearchRetriever:
     """Creates a MongoDB Atlas hybrid search retriever with the given embedding model.
 
     Args:
-        embedding_model (HuggingFaceEmbeddings): The embedding model to use for vector search.
+        embedding_model (EmbeddingsModel): The embedding model to use for vector search.
         k (int): Number of documents to retrieve.
 
     Returns:
@@ -67,3 +99,169 @@ def get_hybrid_search_retriever(
     )
 
     return retriever
+
+
+class IngestionGeneration:
+    """Generation of the long-term memory, changed every time it is re-ingested.
+
+    The generation is stored in MongoDB, so ingestions run by another process (e.g.,
+    the CLI) are seen by the API workers. Reads are trusted for
+    `check_interval_seconds`, bounding how long results of a previous ingestion can
+    still be served.
+
+    Args:
+        collection (Collection): The collection storing the generation.
+        check_interval_seconds (float): Seconds a read generation is trusted.
+    """
+
+    DOCUMENT_ID = "long_term_memory"
+
+    def __init__(self, collection: Collection, check_interval_seconds: float) -> None:
+        self.collection = collection
+        self.check_interval_seconds = check_interval_seconds
+
+        self._generation: Optional[str] = None
+        self._checked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_retriever(cls, retriever: Retriever) -> "IngestionGeneration":
+        """Creates the generation of the long-term memory searched by a retriever.
+
+        Args:
+            retriever (Retriever): The hybrid search retriever, whose MongoDB client is
+                reused.
+
+        Returns:
+            IngestionGeneration: The generation, checked as often as set in the settings.
+        """
+        database = retriever.vectorstore.collection.database
+
+        return cls(
+            collection=database[settings.MONGO_LONG_TERM_MEMORY_METADATA_COLLECTION],
+            check_interval_seconds=settings.RAG_RETRIEVAL_CACHE_GENERATION_CHECK_SECONDS,
+        )
+
+    def get(self) -> Optional[str]:
+        """Get the current generation, reading it from MongoDB once the read is stale.
+
+        Returns:
+            Optional[str]: The generation, or None if the memory was never ingested
+                since generations were introduced.
+        """
+        with self._lock:
+            if time.monotonic() < self._checked_until:
+                return self._generation
+
+        document = self.collection.find_one({"_id": self.DOCUMENT_ID})
+        with self._lock:
+            self._generation = document["generation"] if document else None
+            self._checked_until = time.monotonic() + self.check_interval_seconds
+
+            return self._generation
+
+    async def aget(self) -> Optional[str]:
+        """Get the current generation without blocking the event loop on MongoDB."""
+        with self._lock:
+            if time.monotonic() < self._checked_until:
+                return self._generation
+
+        return await asyncio.to_thread(self.get)
+
+    def bump(self) -> str:
+        """Start a new generation, invalidating the results cached by every process.
+
+        Returns:
+            str: The new generation.
+        """
+        generation = uuid.uuid4().hex
+        self.collection.update_one(
+            {"_id": self.DOCUMENT_ID},
+            {
+                "$set": {
+                    "generation": generation,
+                    "ingested_at": datetime.now(timezone.utc),
+                }
+            },
+            upsert=True,
+        )
+        with self._lock:
+            self._generation = generation
+            self._checked_until = time.monotonic() + self.check_interval_seconds
+
+        return generation
+
+
+class CachedRetriever(BaseRetriever):
+    """Retriever wrapper that caches results by normalized query and top_k.
+
+    Results are also keyed by the ingestion generation, if set, so results of a
+    previous ingestion are no longer served once the long-term memory is re-ingested.
+
+    Attributes:
+        retriever (BaseRetriever): The wrapped retriever.
+        cache (TTLCache): The cache holding the retrieved documents.
+        top_k (int): Number of documents returned by the wrapped retriever.
+        generation (IngestionGeneration, optional): The generation of the searched data.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    retriever: BaseRetriever
+    cache: TTLCache
+    top_k: int
+    generation: Optional[IngestionGeneration] = None
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        generation = self.generation.get() if self.generation else None
+        key = self.__cache_key(generation, query)
+        documents = self.cache.get(key)
+        if documents is None:
+            documents = self.retriever.invoke(
+                query, config={"callbacks": run_manager.get_child()}
+            )
+            self.cache.put(key, documents)
+
+        return list(documents)
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        generation = await self.generation.aget() if self.generation else None
+        key = self.__cache_key(generation, query)
+        documents = self.cache.get(key)
+        if documents is None:
+            documents = await self.retriever.ainvoke(
+                query, config={"callbacks": run_manager.get_child()}
+            )
+            self.cache.put(key, documents)
+
+        return list(documents)
+
+    def __cache_key(
+        self, generation: Optional[str], query: str
+    ) -> tuple[Optional[str], str, int]:
+        return generation, " ".join(query.casefold().split()), self.top_k
+
+
+def get_cached_retriever(retriever: Retriever) -> BaseRetriever:
+    """Wraps a hybrid search retriever with the process-wide retrieval cache.
+
+    Args:
+        retriever (Retriever): The hybrid search retriever to wrap.
+
+    Returns:
+        BaseRetriever: A retriever serving repeated queries from the cache, or the
+            retriever itself if the retrieval cache is disabled.
+    """
+    if not settings.RAG_RETRIEVAL_CACHE_ENABLED:
+        return retriever
+
+    return CachedRetriever(
+        retriever=retriever,
+        cache=retrieval_cache,
+        top_k=retriever.top_k,
+        generation=IngestionGeneration.from_retriever(retriever),
+    )
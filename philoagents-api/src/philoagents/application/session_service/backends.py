@@ -0,0 +1,125 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from loguru import logger
+from pymongo import MongoClient, ReturnDocument
+from pymongo.collection import Collection
+
+from philoagents.config import settings
+
+
+class SessionBackend(ABC):
+    """Shared store of user sessions, used by every worker of the API.
+
+    Methods are blocking and called from worker threads, so they must be thread-safe.
+    """
+
+    @abstractmethod
+    def create(self, user_id: str, created_at: datetime) -> None:
+        """Store a new session, replacing any previous session of the same user."""
+
+    @abstractmethod
+    def refresh(self, user_id: str, timeout_minutes: int) -> Optional[datetime]:
+        """Record activity on a session, if it exists and hasn't expired.
+
+        Args:
+            user_id: The user ID of the session.
+            timeout_minutes: Minutes of inactivity after which the session is expired.
+
+        Returns:
+            Optional[datetime]: The creation time of the session, or None if it doesn't
+                exist or expired.
+        """
+
+    @abstractmethod
+    def delete(self, user_id: str) -> bool:
+        """Delete a session, returning whether it existed."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Count the stored sessions."""
+
+
+class MongoSessionBackend(SessionBackend):
+    """Session backend on a MongoDB collection with a TTL index on the last activity.
+
+    Expired sessions are never returned, and MongoDB deletes them in the background.
+    Works with any PyMongo-compatible collection, e.g., one from `mongomock`.
+
+    Args:
+        collection: The collection storing the sessions.
+        timeout_minutes: Minutes of inactivity after which MongoDB deletes a session.
+    """
+
+    def __init__(self, collection: Collection, timeout_minutes: int) -> None:
+        self.collection = collection
+        self.timeout_minutes = timeout_minutes
+        self._indexed = False
+
+    def create(self, user_id: str, created_at: datetime) -> None:
+        self.__ensure_index()
+        self.collection.replace_one(
+            {"_id": user_id},
+            {"created_at": created_at, "last_activity": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+
+    def refresh(self, user_id: str, timeout_minutes: int) -> Optional[datetime]:
+        self.__ensure_index()
+        now = datetime.now(timezone.utc)
+        document = self.collection.find_one_and_update(
+            {
+                "_id": user_id,
+                "last_activity": {"$gt": now - timedelta(minutes=timeout_minutes)},
+            },
+            {"$set": {"last_activity": now}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if document is None:
+            return None
+
+        return self.__as_utc(document["created_at"])
+
+    def delete(self, user_id: str) -> bool:
+        return self.collection.delete_one({"_id": user_id}).deleted_count > 0
+
+    def count(self) -> int:
+        cutoff = datetime.now(timezone.utc) - timedelta(minutes=self.timeout_minutes)
+
+        return self.collection.count_documents({"last_activity": {"$gt": cutoff}})
+
+    def __ensure_index(self) -> None:
+        if self._indexed:
+            return
+
+        self.collection.create_index(
+            "last_activity", expireAfterSeconds=self.timeout_minutes * 60
+        )
+        self._indexed = True
+
+    @staticmethod
+    def __as_utc(value: datetime) -> datetime:
+        # MongoDB returns naive UTC datetimes unless the client is timezone aware.
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def get_session_backend() -> Optional[SessionBackend]:
+    """Gets the session backend selected in the settings.
+
+    Returns:
+        Optional[SessionBackend]: The shared backend, or None to keep the sessions in
+            the memory of the process.
+    """
+    if settings.SESSION_BACKEND == "memory":
+        return None
+
+    logger.info(
+        f"Using MongoDB session backend | collection: {settings.MONGO_SESSIONS_COLLECTION}"
+    )
+    client = MongoClient(settings.MONGO_URI, appname="philoagents")
+
+    return MongoSessionBackend(
+        collection=client[settings.MONGO_DB_NAME][settings.MONGO_SESSIONS_COLLECTION],
+        timeout_minutes=settings.SESSION_TIMEOUT_MINUTES,
+    )
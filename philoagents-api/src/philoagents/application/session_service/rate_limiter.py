@@ -0,0 +1,157 @@
+import time
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+from philoagents.config import settings
+
+
+class EndpointClass(str, Enum):
+    """Classes of endpoints sharing a rate limit."""
+
+    CHAT = "chat"
+    BATCH = "batch"
+    RESET = "reset"
+
+
+class TokenBucketLimiter:
+    """Token-bucket rate limiter keyed by user.
+
+    Every key gets a bucket of `burst` tokens refilled at `rate_per_second`. Buckets
+    are stored compactly in two float arrays, holding the token counts and the refill
+    times, indexed by a slot per key. Slots of released buckets are reused, and buckets
+    that refilled completely are pruned with a vectorized sweep, as they are equivalent
+    to a new bucket.
+
+    Args:
+        rate_per_second: Tokens added to a bucket per second.
+        burst: Capacity of a bucket.
+        initial_capacity: Number of buckets allocated up front.
+    """
+
+    def __init__(
+        self, rate_per_second: float, burst: float, initial_capacity: int = 1024
+    ) -> None:
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+
+        self._slots: dict[str, int] = {}
+        self._keys: list[Optional[str]] = []
+        self._free_slots: list[int] = []
+        self._tokens = np.zeros(initial_capacity, dtype=np.float64)
+        self._refilled_at = np.zeros(initial_capacity, dtype=np.float64)
+
+        self.allowed = 0
+        self.rejected = 0
+
+    def try_consume(self, key: str, cost: float = 1) -> float:
+        """Take tokens from the bucket of a key, if it holds enough.
+
+        Args:
+            key: The key of the bucket, e.g., the user ID.
+            cost: Number of tokens to take.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds to wait until the
+                bucket holds enough tokens.
+        """
+        now = time.monotonic()
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self.__allocate(key)
+            tokens = self.burst
+        else:
+            elapsed = now - float(self._refilled_at[slot])
+            tokens = min(
+                self.burst, float(self._tokens[slot]) + elapsed * self.rate_per_second
+            )
+        self._refilled_at[slot] = now
+
+        if tokens >= cost:
+            self._tokens[slot] = tokens - cost
+            self.allowed += 1
+            return 0.0
+
+        self._tokens[slot] = tokens
+        self.rejected += 1
+        return (cost - tokens) / self.rate_per_second
+
+    def release(self, key: str) -> None:
+        """Drop the bucket of a key, which starts full if the key comes back."""
+        slot = self._slots.pop(key, None)
+        if slot is not None:
+            self._keys[slot] = None
+            self._free_slots.append(slot)
+
+    def prune(self) -> int:
+        """Drop the buckets that refilled completely.
+
+        Returns:
+            int: Number of dropped buckets.
+        """
+        size = len(self._keys)
+        elapsed = time.monotonic() - self._refilled_at[:size]
+        full = self._tokens[:size] + elapsed * self.rate_per_second >= self.burst
+
+        pruned = 0
+        for slot in np.flatnonzero(full):
+            key = self._keys[slot]
+            if key is not None:
+                self.release(key)
+                pruned += 1
+
+        return pruned
+
+    def stats(self) -> dict:
+        """Get the limiter metrics.
+
+        Returns:
+            dict: Allowed and rejected requests, and the number of tracked buckets.
+        """
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+            "buckets": len(self._slots),
+        }
+
+    def __allocate(self, key: str) -> int:
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            if slot == len(self._tokens):
+                capacity = max(1, 2 * slot)
+                self._tokens = np.resize(self._tokens, capacity)
+                self._refilled_at = np.resize(self._refilled_at, capacity)
+        self._slots[key] = slot
+
+        return slot
+
+
+def get_rate_limiters() -> dict[EndpointClass, TokenBucketLimiter]:
+    """Gets the rate limiters of the endpoint classes configured in the settings.
+
+    Returns:
+        dict[EndpointClass, TokenBucketLimiter]: The limiter of every endpoint class,
+            or an empty dict if rate limiting is disabled.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return {}
+
+    return {
+        EndpointClass.CHAT: TokenBucketLimiter(
+            rate_per_second=settings.RATE_LIMIT_CHAT_PER_MINUTE / 60,
+            burst=settings.RATE_LIMIT_CHAT_BURST,
+        ),
+        EndpointClass.BATCH: TokenBucketLimiter(
+            rate_per_second=settings.RATE_LIMIT_BATCH_PER_MINUTE / 60,
+            burst=settings.RATE_LIMIT_BATCH_BURST,
+        ),
+        EndpointClass.RESET: TokenBucketLimiter(
+            rate_per_second=settings.RATE_LIMIT_RESET_PER_MINUTE / 60,
+            burst=settings.RATE_LIMIT_RESET_BURST,
+        ),
+    }
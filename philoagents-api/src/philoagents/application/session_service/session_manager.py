@@ -1,41 +1,122 @@
 import uuid
+from collections import OrderedDict
 from typing import Optional
-from datetime import datetime, timedelta, timezone
-from dataclasses import dataclass, field
+from datetime import datetime, timezone
 import asyncio
+import time
 from loguru import logger
 
+from philoagents.config import settings
+
+from .backends import SessionBackend, get_session_backend
+from .rate_limiter import EndpointClass, TokenBucketLimiter, get_rate_limiters
+
 
-@dataclass
 class UserSession:
-    """Represents a user session with unique identifier and metadata."""
-    
-    user_id: str
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    last_activity: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    is_active: bool = True
-    
+    """Represents a user session with unique identifier and metadata.
+
+    Timestamps are stored as floats in `__slots__`: the creation time as a Unix
+    timestamp and the last activity as a monotonic clock reading, so activity updates
+    and expiry checks don't allocate and are immune to wall clock changes. Both are
+    exposed as timezone-aware datetimes.
+    """
+
+    __slots__ = ("user_id", "is_active", "_created_at", "_last_activity")
+
+    def __init__(
+        self,
+        user_id: str,
+        created_at: Optional[datetime] = None,
+        last_activity: Optional[datetime] = None,
+        is_active: bool = True,
+    ) -> None:
+        self.user_id = user_id
+        self.is_active = is_active
+        self._created_at = created_at.timestamp() if created_at else time.time()
+        self._last_activity = time.monotonic()
+        if last_activity is not None:
+            self.last_activity = last_activity
+
+    @property
+    def created_at(self) -> datetime:
+        """When the session was created."""
+        return datetime.fromtimestamp(self._created_at, tz=timezone.utc)
+
+    @property
+    def last_activity(self) -> datetime:
+        """When the session was last used."""
+        elapsed = time.monotonic() - self._last_activity
+        return datetime.fromtimestamp(time.time() - elapsed, tz=timezone.utc)
+
+    @last_activity.setter
+    def last_activity(self, value: datetime) -> None:
+        elapsed = time.time() - value.timestamp()
+        self._last_activity = time.monotonic() - elapsed
+
     def update_activity(self) -> None:
         """Update the last activity timestamp."""
-        self.last_activity = datetime.now(timezone.utc)
-    
+        self._last_activity = time.monotonic()
+
     def is_expired(self, timeout_minutes: int = 60) -> bool:
         """Check if the session has expired based on inactivity."""
-        timeout_delta = timedelta(minutes=timeout_minutes)
-        return datetime.now(timezone.utc) - self.last_activity > timeout_delta
+        return time.monotonic() - self._last_activity > timeout_minutes * 60
+
+    def __repr__(self) -> str:
+        return (
+            f"UserSession(user_id={self.user_id!r}, created_at={self.created_at!r}, "
+            f"last_activity={self.last_activity!r}, is_active={self.is_active!r})"
+        )
 
 
 class SessionManager:
-    """Manages user sessions for the philoagents application."""
-    
-    def __init__(self, session_timeout_minutes: int = 60):
+    """Manages user sessions for the philoagents application.
+
+    Sessions are kept in an ordered dict sorted by last activity: every access moves the
+    session to the end. As all sessions share the same inactivity timeout, the dict is
+    also an expiry queue, so lookups and expiry are O(1) and the cleanup only walks the
+    expired sessions at its front.
+
+    With a shared backend, the dict becomes a near-cache of at most
+    `near_cache_max_entries` sessions. A cached session is used without a round-trip
+    for `near_cache_ttl_seconds`, after which its activity is written to the backend,
+    which also reveals sessions invalidated or kept alive by other workers.
+
+    With a backend, the synchronous methods block on its round-trips. Async callers use
+    the `a`-prefixed variants instead, which run them in a worker thread so the event
+    loop isn't blocked.
+
+    The manager also rate limits users with a token bucket per endpoint class. Buckets
+    are local to the process, so with several workers a user gets the configured rate
+    on each of them.
+    """
+
+    def __init__(
+        self,
+        session_timeout_minutes: int = 60,
+        backend: Optional[SessionBackend] = None,
+        near_cache_ttl_seconds: float = 5,
+        near_cache_max_entries: int = 100_000,
+        rate_limiters: Optional[dict[EndpointClass, TokenBucketLimiter]] = None,
+    ):
         """Initialize the session manager.
-        
+
         Args:
             session_timeout_minutes: Minutes of inactivity before session expires
+            backend: Optional shared session store. Sessions only live in the memory
+                of the process if None
+            near_cache_ttl_seconds: Seconds a session read from the backend is trusted
+            near_cache_max_entries: Maximum number of sessions cached in memory when
+                using a backend
+            rate_limiters: Optional limiter of every rate limited endpoint class.
+                Endpoint classes without a limiter are not limited
         """
-        self._sessions: dict[str, UserSession] = {}
+        self._sessions: OrderedDict[str, UserSession] = OrderedDict()
         self._session_timeout_minutes = session_timeout_minutes
+        self._backend = backend
+        self._near_cache_ttl_seconds = near_cache_ttl_seconds
+        self._near_cache_max_entries = near_cache_max_entries
+        self._synced_at: dict[str, float] = {}
+        self._rate_limiters = rate_limiters or {}
         self._cleanup_task: Optional[asyncio.Task] = None
         logger.info(f"SessionManager __init__ called. Instance id: {id(self)}")
         # Do not start cleanup task here; must be started from async context
@@ -52,129 +133,324 @@ class SessionManager:
 
     def create_session(self, user_id: Optional[str] = None) -> UserSession:
         """Create a new user session with a unique or provided identifier.
-        
+
         Args:
             user_id: Optional user ID to use for the session
         Returns:
             UserSession: The newly created session
         """
-        if user_id is None:
-            user_id = str(uuid.uuid4())
-        session = UserSession(user_id=user_id)
-        self._sessions[user_id] = session
-        logger.info(f"Created new session for user: {user_id}")
-        logger.info(f"[create_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions: {list(self._sessions.keys())}")
-        return session
+        session = UserSession(user_id=user_id or str(uuid.uuid4()))
+        if self._backend is not None:
+            self._backend.create(session.user_id, session.created_at)
+        return self.__created(session)
+
+    async def acreate_session(self, user_id: Optional[str] = None) -> UserSession:
+        """Create a new user session, without blocking the event loop.
+
+        Args:
+            user_id: Optional user ID to use for the session
+        Returns:
+            UserSession: The newly created session
+        """
+        session = UserSession(user_id=user_id or str(uuid.uuid4()))
+        if self._backend is not None:
+            await asyncio.to_thread(
+                self._backend.create, session.user_id, session.created_at
+            )
+        return self.__created(session)
 
     def get_session(self, user_id: str) -> Optional[UserSession]:
         """Retrieve a session by user ID.
-        
+
         Args:
             user_id: The unique user identifier
-            
+
         Returns:
             UserSession if found and active, None otherwise
         """
-        session = self._sessions.get(user_id)
-        logger.info(f"[get_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions: {list(self._sessions.keys())}")
-        if session is None:
-            return None
-            
-        if session.is_expired(self._session_timeout_minutes):
+        if self.__needs_refresh(user_id):
+            created_at = self._backend.refresh(user_id, self._session_timeout_minutes)
+            return self.__refreshed(user_id, created_at)
+
+        if self.__is_expired(user_id):
             self.invalidate_session(user_id)
             return None
-            
-        session.update_activity()
-        return session
-    
+
+        return self.__touch(user_id)
+
+    async def aget_session(self, user_id: str) -> Optional[UserSession]:
+        """Retrieve a session by user ID, without blocking the event loop.
+
+        Args:
+            user_id: The unique user identifier
+
+        Returns:
+            UserSession if found and active, None otherwise
+        """
+        if self.__needs_refresh(user_id):
+            created_at = await asyncio.to_thread(
+                self._backend.refresh, user_id, self._session_timeout_minutes
+            )
+            return self.__refreshed(user_id, created_at)
+
+        if self.__is_expired(user_id):
+            await self.ainvalidate_session(user_id)
+            return None
+
+        return self.__touch(user_id)
+
     def get_or_create_session(self, user_id: Optional[str] = None) -> UserSession:
         """Get an existing session or create a new one.
-        
+
         Args:
             user_id: Optional user ID to retrieve existing session
-            
+
         Returns:
             UserSession: Existing session or newly created one
         """
-        logger.info(f"[get_or_create_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions: {list(self._sessions.keys())}")
         if user_id:
             session = self.get_session(user_id)
-            logger.info(f"Session: {session}")
             if session:
                 return session
             # If session does not exist, create with provided user_id
             return self.create_session(user_id=user_id)
         return self.create_session()
-    
+
+    async def aget_or_create_session(
+        self, user_id: Optional[str] = None
+    ) -> UserSession:
+        """Get an existing session or create a new one, without blocking the event loop.
+
+        Args:
+            user_id: Optional user ID to retrieve existing session
+
+        Returns:
+            UserSession: Existing session or newly created one
+        """
+        if user_id:
+            session = await self.aget_session(user_id)
+            if session:
+                return session
+            return await self.acreate_session(user_id=user_id)
+        return await self.acreate_session()
+
     def invalidate_session(self, user_id: str) -> bool:
         """Invalidate and remove a session.
-        
+
         Args:
             user_id: The user ID whose session to invalidate
-            
+
         Returns:
             bool: True if session was found and removed, False otherwise
         """
-        logger.info(f"[invalidate_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions before: {list(self._sessions.keys())}")
-        session = self._sessions.pop(user_id, None)
-        if session:
-            session.is_active = False
-            logger.info(f"Invalidated session for user: {user_id}")
-            logger.info(f"[invalidate_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions after: {list(self._sessions.keys())}")
-            return True
-        logger.info(f"[invalidate_session] Instance id: {id(self)} | user_id: {user_id} | Current sessions after: {list(self._sessions.keys())}")
-        return False
-    
+        session = self.__deactivate(user_id)
+        if self._backend is not None:
+            found = self._backend.delete(user_id)
+        else:
+            found = session is not None
+        return self.__invalidated(user_id, found)
+
+    async def ainvalidate_session(self, user_id: str) -> bool:
+        """Invalidate and remove a session, without blocking the event loop.
+
+        Args:
+            user_id: The user ID whose session to invalidate
+
+        Returns:
+            bool: True if session was found and removed, False otherwise
+        """
+        session = self.__deactivate(user_id)
+        if self._backend is not None:
+            found = await asyncio.to_thread(self._backend.delete, user_id)
+        else:
+            found = session is not None
+        return self.__invalidated(user_id, found)
+
     def get_active_session_count(self) -> int:
         """Get the number of currently active sessions.
-        
+
         Returns:
             int: Number of active sessions
         """
+        if self._backend is not None:
+            return self._backend.count()
         return len(self._sessions)
-    
+
+    async def aget_active_session_count(self) -> int:
+        """Get the number of currently active sessions, without blocking the event loop.
+
+        Returns:
+            int: Number of active sessions
+        """
+        if self._backend is not None:
+            return await asyncio.to_thread(self._backend.count)
+        return len(self._sessions)
+
     def create_thread_id(self, user_id: str, philosopher_id: str) -> str:
         """Create a composite thread ID for conversation isolation.
-        
+
         Args:
             user_id: The unique user identifier
             philosopher_id: The philosopher identifier
-            
+
         Returns:
             str: Composite thread ID in format "user_id:philosopher_id"
         """
         return f"{user_id}:{philosopher_id}"
-    
+
+    def check_rate_limit(self, key: str, endpoint_class: EndpointClass) -> float:
+        """Count a request against the rate limit of a user.
+
+        Args:
+            key: The user ID, or another key identifying the client
+            endpoint_class: The class of the requested endpoint
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds to wait before
+                retrying
+        """
+        limiter = self._rate_limiters.get(endpoint_class)
+        if limiter is None:
+            return 0.0
+
+        return limiter.try_consume(key)
+
+    def get_rate_limit_stats(self) -> dict:
+        """Get the rate limiting metrics.
+
+        Returns:
+            dict: Allowed and rejected requests and tracked buckets per endpoint class
+        """
+        return {
+            endpoint_class.value: limiter.stats()
+            for endpoint_class, limiter in self._rate_limiters.items()
+        }
+
+    def remove_expired_sessions(self) -> int:
+        """Remove the expired sessions, walking the expiry queue from its oldest end.
+
+        With a backend, sessions are only dropped from the near-cache, as they may be
+        active on other workers. The backend expires them on its own.
+
+        Returns:
+            int: Number of removed sessions
+        """
+        removed = 0
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if not session.is_expired(self._session_timeout_minutes):
+                break
+
+            if self._backend is not None:
+                self.__evict(user_id)
+            else:
+                self.invalidate_session(user_id)
+            removed += 1
+
+        return removed
+
+    def __needs_refresh(self, user_id: str) -> bool:
+        return self._backend is not None and (
+            user_id not in self._sessions or not self.__is_synced(user_id)
+        )
+
+    def __is_expired(self, user_id: str) -> bool:
+        session = self._sessions.get(user_id)
+        return session is not None and session.is_expired(self._session_timeout_minutes)
+
+    def __touch(self, user_id: str) -> Optional[UserSession]:
+        session = self._sessions.get(user_id)
+        if session is None:
+            return None
+
+        session.update_activity()
+        self._sessions.move_to_end(user_id)
+        return session
+
+    def __created(self, session: UserSession) -> UserSession:
+        self.__cache(session)
+        logger.debug(f"Created new session for user: {session.user_id}")
+        return session
+
+    def __invalidated(self, user_id: str, found: bool) -> bool:
+        if found:
+            logger.debug(f"Invalidated session for user: {user_id}")
+        return found
+
+    def __refreshed(
+        self, user_id: str, created_at: Optional[datetime]
+    ) -> Optional[UserSession]:
+        if created_at is None:
+            self.__evict(user_id)
+            return None
+
+        session = self._sessions.get(user_id)
+        if session is None:
+            session = UserSession(user_id=user_id, created_at=created_at)
+        else:
+            session.update_activity()
+        self.__cache(session)
+        return session
+
+    def __cache(self, session: UserSession) -> None:
+        self._sessions[session.user_id] = session
+        self._sessions.move_to_end(session.user_id)
+        if self._backend is None:
+            return
+
+        self._synced_at[session.user_id] = time.monotonic()
+        while len(self._sessions) > self._near_cache_max_entries:
+            self.__evict(next(iter(self._sessions)))
+
+    def __evict(self, user_id: str) -> Optional[UserSession]:
+        self._synced_at.pop(user_id, None)
+        return self._sessions.pop(user_id, None)
+
+    def __deactivate(self, user_id: str) -> Optional[UserSession]:
+        session = self.__evict(user_id)
+        if session:
+            session.is_active = False
+        return session
+
+    def __is_synced(self, user_id: str) -> bool:
+        synced_at = self._synced_at.get(user_id)
+        return (
+            synced_at is not None
+            and time.monotonic() - synced_at < self._near_cache_ttl_seconds
+        )
+
     async def _cleanup_expired_sessions(self) -> None:
         """Background task to periodically clean up expired sessions."""
         while True:
             try:
-                expired_users = [
-                    user_id for user_id, session in self._sessions.items()
-                    if session.is_expired(self._session_timeout_minutes)
-                ]
-                
-                for user_id in expired_users:
-                    self.invalidate_session(user_id)
-                
-                if expired_users:
-                    logger.info(f"Cleaned up {len(expired_users)} expired sessions")
-                
-                # Run cleanup every 10 minutes
-                await asyncio.sleep(600)
-                
+                removed = self.remove_expired_sessions()
+                if removed:
+                    logger.info(f"Cleaned up {removed} expired sessions")
+                for limiter in self._rate_limiters.values():
+                    limiter.prune()
+
+                # Only expired sessions are visited, so the cleanup can run often
+                await asyncio.sleep(60)
+
             except Exception as e:
                 logger.error(f"Error in session cleanup task: {e}")
                 await asyncio.sleep(60)  # Wait a minute before retrying
-    
+
     def shutdown(self) -> None:
         """Shutdown the session manager and cleanup resources."""
         if self._cleanup_task and not self._cleanup_task.done():
             self._cleanup_task.cancel()
-        
+
         self._sessions.clear()
+        self._synced_at.clear()
         logger.info("Session manager shutdown complete")
 
 
 # Global session manager instance
-session_manager = SessionManager()
+session_manager = SessionManager(
+    session_timeout_minutes=settings.SESSION_TIMEOUT_MINUTES,
+    backend=get_session_backend(),
+    near_cache_ttl_seconds=settings.SESSION_NEAR_CACHE_TTL_SECONDS,
+    near_cache_max_entries=settings.SESSION_NEAR_CACHE_MAX_ENTRIES,
+    rate_limiters=get_rate_limiters(),
+)
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -13,6 +14,13 @@ class Settings(BaseSettings):
     GROQ_API_KEY: str
     GROQ_LLM_MODEL: str = "qwen/qwen3-32b"
     GROQ_LLM_MODEL_CONTEXT_SUMMARY: str = "qwen/qwen3-32b"
+    GROQ_HTTP_MAX_CONNECTIONS: int = 100
+    GROQ_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GROQ_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    GROQ_WARM_UP_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        description="Maximum time spent warming up the LLM provider connection at startup.",
+    )
 
     # --- OpenAI Configuration (Required for evaluation) ---
     OPENAI_API_KEY: str | None = Field(
@@ -28,6 +36,85 @@ class Settings(BaseSettings):
     MONGO_STATE_CHECKPOINT_COLLECTION: str = "philosopher_state_checkpoints"
     MONGO_STATE_WRITES_COLLECTION: str = "philosopher_state_writes"
     MONGO_LONG_TERM_MEMORY_COLLECTION: str = "philosopher_long_term_memory"
+    MONGO_LONG_TERM_MEMORY_METADATA_COLLECTION: str = (
+        "philosopher_long_term_memory_metadata"
+    )
+    MONGO_SESSIONS_COLLECTION: str = "user_sessions"
+    MONGO_PROVISION_INDEXES: bool = Field(
+        default=True,
+        description="Create the missing indexes of the collections used by the API on startup.",
+    )
+
+    # --- Session Configuration ---
+    SESSION_TIMEOUT_MINUTES: int = 60
+    SESSION_BACKEND: Literal["memory", "mongo"] = Field(
+        default="memory",
+        description="Keep sessions per process, or share them between workers through MongoDB.",
+    )
+    SESSION_NEAR_CACHE_TTL_SECONDS: float = Field(
+        default=5,
+        description="Seconds a worker trusts its cached copy of a session shared through MongoDB.",
+    )
+    SESSION_NEAR_CACHE_MAX_ENTRIES: int = 100_000
+
+    # --- Checkpoint Storage Configuration ---
+    CHECKPOINT_COMPACTION_ENABLED: bool = Field(
+        default=True,
+        description="Periodically delete superseded conversation checkpoints from the API server.",
+    )
+    CHECKPOINT_COMPACTION_INTERVAL_MINUTES: float = 60
+    CHECKPOINT_RETENTION_KEEP_LAST: int = Field(
+        default=20,
+        ge=1,
+        description="Number of most recent checkpoints kept per conversation thread.",
+    )
+    CHECKPOINT_RETENTION_IDLE_TTL_DAYS: Optional[float] = Field(
+        default=None,
+        description="Delete the conversation threads idle for longer than this. Never if unset.",
+    )
+    CHECKPOINT_COMPRESSION: Literal["none", "zlib", "zstd"] = Field(
+        default="none",
+        description="Compress the stored checkpoints. Checkpoints stored with any setting stay readable.",
+    )
+    CHECKPOINT_COMPRESSION_LEVEL: int = 3
+    CHECKPOINT_CACHE_ENABLED: bool = Field(
+        default=False,
+        description="Serve the latest checkpoint of hot threads from memory. Only enable it with a "
+        "single API worker: other workers, replicas and CLI resets don't invalidate the cache.",
+    )
+    CHECKPOINT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CHECKPOINT_CACHE_TTL_SECONDS: int = 600
+    CHECKPOINT_DURABILITY: Literal["sync", "async"] = Field(
+        default="sync",
+        description="Wait for MongoDB to store each checkpoint ('sync'), or queue checkpoints per "
+        "thread and store them in bulk in the background ('async'). With 'async', the checkpoints of "
+        "the last flush interval are lost if the API server crashes, but not on graceful shutdown.",
+    )
+    CHECKPOINT_WRITE_BEHIND_FLUSH_INTERVAL_MS: float = 100
+    CHECKPOINT_WRITE_BEHIND_BATCH_SIZE: int = 500
+    CHECKPOINT_WRITE_BEHIND_MAX_BACKLOG: int = Field(
+        default=10_000,
+        description="Pending checkpoint operations above which chat turns wait for a flush.",
+    )
+
+    # --- Rate Limiting Configuration ---
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_CHAT_PER_MINUTE: float = Field(
+        default=30,
+        description="Chat turns a user regains per minute, on /chat, /chat/stream and /ws/chat.",
+    )
+    RATE_LIMIT_CHAT_BURST: int = 10
+    RATE_LIMIT_BATCH_PER_MINUTE: float = Field(
+        default=120,
+        description="Batch chat turns a user regains per minute, on /chat/batch. Turns over the "
+        "limit wait for their turn instead of failing.",
+    )
+    RATE_LIMIT_BATCH_BURST: int = 20
+    RATE_LIMIT_RESET_PER_MINUTE: float = Field(
+        default=1,
+        description="Memory resets a user regains per minute, on /reset-memory.",
+    )
+    RATE_LIMIT_RESET_BURST: int = 3
 
     # --- Comet ML & Opik Configuration ---
     COMET_API_KEY: str | None = Field(
@@ -37,10 +124,82 @@ class Settings(BaseSettings):
         default="philoagents_course",
         description="Project name for Comet ML and Opik tracking.",
     )
+    OPIK_TRACE_SAMPLING_RATE: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Fraction of conversation turns traced with Opik.",
+    )
+    OPIK_EXPORT_QUEUE_SIZE: int = Field(
+        default=64,
+        description="Maximum number of pending trace exports before new ones are dropped.",
+    )
+    OPIK_FLUSH_TIMEOUT_SECONDS: int = Field(
+        default=10,
+        description="Maximum time the background exporter waits for a single Opik flush.",
+    )
 
     # --- Agents Configuration ---
     TOTAL_MESSAGES_SUMMARY_TRIGGER: int = 30
     TOTAL_MESSAGES_AFTER_SUMMARY: int = 5
+    SUMMARIZATION_MODE: Literal["inline", "deferred"] = Field(
+        default="inline",
+        description="Summarize long conversations inside the turn or in background workers after it.",
+    )
+    SUMMARIZATION_WORKERS: int = 2
+    SUMMARIZATION_QUEUE_SIZE: int = 256
+
+    # --- Admission Control Configuration ---
+    ADMISSION_MAX_IN_FLIGHT: int = Field(
+        default=32,
+        description="Maximum number of workflow graph runs executing at once.",
+    )
+    ADMISSION_MAX_QUEUE_SIZE: int = Field(
+        default=128,
+        description="Maximum number of graph runs waiting for a slot before rejecting new ones.",
+    )
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 30
+
+    LLM_SCHEDULER_MAX_CONCURRENCY: int = Field(
+        default=16,
+        description="Maximum number of concurrent LLM calls, shared fairly between users and priority classes.",
+    )
+
+    # --- Response Cache Configuration ---
+    RESPONSE_CACHE_ENABLED: bool = Field(
+        default=False,
+        description="Answer near-duplicate opening questions from a semantic cache.",
+    )
+    RESPONSE_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    RESPONSE_CACHE_MAX_ENTRIES: int = 2048
+
+    # --- Batch Chat Configuration ---
+    BATCH_CHAT_MAX_PARALLELISM: int = Field(
+        default=8,
+        description="Maximum number of turns of a /chat/batch request running at once.",
+    )
+    BATCH_CHAT_MAX_TURNS: int = 1000
+
+    # --- Streaming Configuration ---
+    WS_STREAM_FLUSH_INTERVAL_MS: float = Field(
+        default=50,
+        description="Maximum time a streamed token is buffered before its frame is sent. "
+        "Every token gets its own frame if set to 0.",
+    )
+    WS_STREAM_FLUSH_CHARS: int = 64
+    SSE_HEARTBEAT_INTERVAL_SECONDS: float = Field(
+        default=15,
+        description="Idle time after which a heartbeat comment is sent on /chat/stream.",
+    )
+    WS_MAX_CONCURRENT_REQUESTS: int = Field(
+        default=4,
+        description="Maximum number of tagged requests streamed at once on a WebSocket.",
+    )
+    WS_STREAM_COMPACT_FRAMES: bool = Field(
+        default=False,
+        description='Send chunks as {"c": ...} frames unless the client asks otherwise.',
+    )
 
     # --- RAG Configuration ---
     RAG_TEXT_EMBEDDING_MODEL_ID: str = "ibm-granite/granite-embedding-107m-multilingual"
@@ -48,6 +207,32 @@ class Settings(BaseSettings):
     RAG_TOP_K: int = 3
     RAG_DEVICE: str = "cpu"
     RAG_CHUNK_SIZE: int = 256
+    RAG_EMBEDDING_CACHE_ENABLED: bool = True
+    RAG_EMBEDDING_CACHE_MAX_ENTRIES: int = 10_000
+    RAG_EMBEDDING_CACHE_DIR: Optional[Path] = Field(
+        default=None,
+        description="Directory of the on-disk embedding cache tier, disabled if unset. "
+        "It must not be shared by processes writing to it concurrently.",
+    )
+    RAG_EMBEDDING_CACHE_DISK_SLOTS: int = 100_000
+    RAG_RETRIEVAL_CACHE_ENABLED: bool = True
+    RAG_RETRIEVAL_CACHE_TTL_SECONDS: int = 600
+    RAG_RETRIEVAL_CACHE_MAX_ENTRIES: int = 4096
+    RAG_RETRIEVAL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    RAG_RETRIEVAL_CACHE_GENERATION_CHECK_SECONDS: float = Field(
+        default=10,
+        description="Seconds between checks for a re-ingested long-term memory, after which "
+        "the results cached from the previous ingestion are no longer served.",
+    )
+    RAG_CONTEXT_COMPRESSION: Literal["llm", "extractive"] = Field(
+        default="llm",
+        description="Shorten retrieved context with an LLM call or with local extractive compression.",
+    )
+    RAG_CONTEXT_TOKEN_BUDGET: int = 300
+    RAG_SPECULATIVE_RETRIEVAL: bool = Field(
+        default=False,
+        description="Start retrieval for the user message while the first LLM call is running.",
+    )
 
     # --- Paths Configuration ---
     EVALUATION_DATASET_FILE_PATH: Path = Path("data/evaluation_dataset.json")
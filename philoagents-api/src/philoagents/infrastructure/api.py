@@ -1,35 +1,92 @@
-from contextlib import asynccontextmanager
-from typing import Optional
-
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+import asyncio
+import json
+import math
+import time
+from contextlib import aclosing, asynccontextmanager, suppress
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from opik.integrations.langchain import OpikTracer
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 
+from philoagents.application.conversation_service.admission import (
+    AdmissionRejectedError,
+    admission_controller,
+)
+from philoagents.application.conversation_service.checkpoint_cache import (
+    checkpoint_cache,
+)
+from philoagents.application.conversation_service.compaction import (
+    checkpoint_compactor,
+)
 from philoagents.application.conversation_service.generate_response import (
     get_response,
     get_streaming_response,
 )
 from philoagents.application.conversation_service.reset_conversation import (
     reset_conversation_state,
+    reset_jobs,
 )
+from philoagents.application.conversation_service.response_cache import response_cache
+from philoagents.application.conversation_service.runtime import conversation_runtime
+from philoagents.application.conversation_service.scheduler import (
+    Priority,
+    llm_scheduler,
+)
+from philoagents.application.conversation_service.summarizer import (
+    background_summarizer,
+)
+from philoagents.application.conversation_service.workflow.chains import chain_registry
+from philoagents.application.rag import get_embedding_cache_stats, retrieval_cache
+from philoagents.application.session_service.rate_limiter import EndpointClass
 from philoagents.application.session_service.session_manager import session_manager
+from philoagents.config import settings
 from philoagents.domain.philosopher_factory import PhilosopherFactory
 
-from .opik_utils import configure
+from .metrics import LATENCY_BUCKETS_SECONDS, Histogram
+from .opik_utils import configure, trace_exporter
+from .streaming import (
+    SSE_HEARTBEAT,
+    coalesce_chunks,
+    encode_chunk_frame,
+    encode_sse_event,
+    with_heartbeats,
+)
 
 configure()
 
+# Time to first token of the responses streamed as Server-Sent Events
+sse_time_to_first_token = Histogram(LATENCY_BUCKETS_SECONDS)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Handles startup and shutdown events for the API."""
     # Startup code (if any) goes here
     session_manager.start_cleanup_task()
+    trace_exporter.start()
+    await conversation_runtime.start()
+    admission_controller.start()
+    llm_scheduler.start()
+    await chain_registry.start()
+    await chain_registry.warm_up()
+    if settings.SUMMARIZATION_MODE == "deferred":
+        await background_summarizer.start()
+    if settings.CHECKPOINT_COMPACTION_ENABLED:
+        checkpoint_compactor.start()
     yield
     # Shutdown code goes here
-    opik_tracer = OpikTracer()
-    opik_tracer.flush()
+    await checkpoint_compactor.close()
+    await reset_jobs.close()
+    await background_summarizer.close()
+    await chain_registry.close()
+    llm_scheduler.close()
+    admission_controller.close()
+    await conversation_runtime.close()
+    await asyncio.to_thread(
+        trace_exporter.shutdown, settings.OPIK_FLUSH_TIMEOUT_SECONDS
+    )
 
 
 app = FastAPI(lifespan=lifespan)
@@ -63,7 +120,7 @@ async def create_session():
         SessionResponse: Session information including user_id
     """
     try:
-        session = session_manager.create_session()
+        session = await session_manager.acreate_session()
         return SessionResponse(
             user_id=session.user_id,
             created_at=session.created_at.isoformat(),
@@ -74,7 +131,9 @@ async def create_session():
 
 
 @app.post("/chat")
-async def chat(chat_message: ChatMessage):
+async def chat(chat_message: ChatMessage, request: Request):
+    __enforce_rate_limit(chat_message.user_id, request, EndpointClass.CHAT)
+
     try:
         philosopher_factory = PhilosopherFactory()
         philosopher = philosopher_factory.get_philosopher(chat_message.philosopher_id)
@@ -90,68 +149,393 @@ async def chat(chat_message: ChatMessage):
             user_id=chat_message.user_id,
         )
         return {"response": response}
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=429, detail=str(e), headers={"Retry-After": "1"}
+        )
     except Exception as e:
-        opik_tracer = OpikTracer()
-        opik_tracer.flush()
+        trace_exporter.request_flush()
 
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/chat/stream")
+async def chat_stream(chat_message: ChatMessage, request: Request):
+    """Streams a philosopher response as Server-Sent Events.
+
+    The stream sends a `start` event, `chunk` events with the batched tokens of the
+    response, then a `done` event with the full response and its time to first token,
+    or an `error` event. Comment lines are sent as heartbeats while the response is
+    idle, so proxies keep the connection open. If the client disconnects, the graph run
+    is cancelled.
+    """
+    __enforce_rate_limit(chat_message.user_id, request, EndpointClass.CHAT)
+
+    try:
+        philosopher_factory = PhilosopherFactory()
+        philosopher = philosopher_factory.get_philosopher(chat_message.philosopher_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events() -> AsyncIterator[str]:
+        start = time.perf_counter()
+        ttft = None
+        response_parts = []
+
+        response_stream = get_streaming_response(
+            messages=chat_message.message,
+            philosopher_id=chat_message.philosopher_id,
+            philosopher_name=philosopher.name,
+            philosopher_perspective=philosopher.perspective,
+            philosopher_style=philosopher.style,
+            philosopher_greeting=philosopher.greeting,
+            philosopher_context="",
+            user_id=chat_message.user_id,
+            priority=Priority.INTERACTIVE,
+        )
+
+        yield encode_sse_event("start", {"streaming": True})
+        try:
+            async with (
+                aclosing(response_stream),
+                aclosing(
+                    coalesce_chunks(
+                        response_stream,
+                        flush_interval_ms=settings.WS_STREAM_FLUSH_INTERVAL_MS,
+                        flush_chars=settings.WS_STREAM_FLUSH_CHARS,
+                    )
+                ) as chunks,
+                aclosing(
+                    with_heartbeats(chunks, settings.SSE_HEARTBEAT_INTERVAL_SECONDS)
+                ) as chunks_and_heartbeats,
+            ):
+                async for chunk in chunks_and_heartbeats:
+                    if chunk is None:
+                        yield SSE_HEARTBEAT
+                        continue
+
+                    if ttft is None:
+                        ttft = time.perf_counter() - start
+                        sse_time_to_first_token.observe(ttft)
+                    response_parts.append(chunk)
+                    yield encode_sse_event("chunk", {"chunk": chunk})
+
+            yield encode_sse_event(
+                "done",
+                {
+                    "response": "".join(response_parts),
+                    "streaming": False,
+                    "ttft_ms": round(ttft * 1000, 1) if ttft is not None else None,
+                    "total_ms": round((time.perf_counter() - start) * 1000, 1),
+                },
+            )
+        except AdmissionRejectedError as e:
+            yield encode_sse_event("error", {"error": str(e), "status": 429})
+        except Exception as e:
+            trace_exporter.request_flush()
+
+            yield encode_sse_event("error", {"error": str(e), "status": 500})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class BatchChatRequest(BaseModel):
+    turns: list[ChatMessage] = Field(min_length=1, max_length=settings.BATCH_CHAT_MAX_TURNS)
+    parallelism: Optional[int] = Field(default=None, ge=1)
+
+
+@app.post("/chat/batch")
+async def chat_batch(request: BatchChatRequest, http_request: Request):
+    """Runs a batch of chat turns in parallel, streaming the results as NDJSON.
+
+    Up to `parallelism` turns run at once, capped by the server settings. Turns of the
+    same user and philosopher share a conversation thread, so they run one after the
+    other in the order they were submitted. Every line of the response is a JSON object
+    with the `index` of the turn in the batch and either its `response` or an `error`,
+    written as soon as the turn completes. Every turn is counted against the batch rate
+    limit of its user, and waits for its turn once the limit is exceeded.
+    """
+    parallelism = min(
+        request.parallelism or settings.BATCH_CHAT_MAX_PARALLELISM,
+        settings.BATCH_CHAT_MAX_PARALLELISM,
+    )
+
+    threads: dict[tuple, list[tuple[int, ChatMessage]]] = {}
+    for index, turn in enumerate(request.turns):
+        # Turns without a user get a new session, hence their own thread.
+        key = (turn.user_id, turn.philosopher_id) if turn.user_id else (None, index)
+        threads.setdefault(key, []).append((index, turn))
+
+    async def results() -> AsyncIterator[str]:
+        queue: asyncio.Queue[dict] = asyncio.Queue()
+        semaphore = asyncio.Semaphore(parallelism)
+
+        async def run_thread(turns: list[tuple[int, ChatMessage]]) -> None:
+            for index, turn in turns:
+                # Throttle the turns over the rate limit instead of failing them.
+                await __wait_for_rate_limit(
+                    __rate_limit_key(turn.user_id, http_request), EndpointClass.BATCH
+                )
+                async with semaphore:
+                    queue.put_nowait(await __run_batch_turn(index, turn))
+
+        tasks = [asyncio.create_task(run_thread(turns)) for turns in threads.values()]
+        try:
+            for _ in range(len(request.turns)):
+                result = await queue.get()
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+async def __run_batch_turn(index: int, turn: ChatMessage) -> dict:
+    result = {
+        "index": index,
+        "user_id": turn.user_id,
+        "philosopher_id": turn.philosopher_id,
+    }
+    try:
+        philosopher_factory = PhilosopherFactory()
+        philosopher = philosopher_factory.get_philosopher(turn.philosopher_id)
+
+        response, _ = await get_response(
+            messages=turn.message,
+            philosopher_id=turn.philosopher_id,
+            philosopher_name=philosopher.name,
+            philosopher_perspective=philosopher.perspective,
+            philosopher_style=philosopher.style,
+            philosopher_greeting=philosopher.greeting,
+            philosopher_context="",
+            user_id=turn.user_id,
+            priority=Priority.BATCH,
+        )
+        result["response"] = response
+    except AdmissionRejectedError as e:
+        result.update(error=str(e), status=429)
+    except Exception as e:
+        trace_exporter.request_flush()
+
+        result.update(error=str(e), status=500)
+
+    return result
+
+
 @app.websocket("/ws/chat")
 async def websocket_chat(websocket: WebSocket):
+    """Streams philosopher responses over a WebSocket.
+
+    Messages carrying a `request_id` are handled concurrently, and every frame of their
+    response is tagged with it. They can be stopped with a
+    `{"type": "cancel", "request_id": ...}` message. Messages without a `request_id`
+    are handled one after the other, in the order they were received.
+    """
     await websocket.accept()
 
+    send_lock = asyncio.Lock()
+    tasks: dict[str, asyncio.Task] = {}
+    untagged_tasks: set[asyncio.Task] = set()
+    untagged_task: Optional[asyncio.Task] = None
+
+    async def send(payload: dict | str) -> None:
+        async with send_lock:
+            if isinstance(payload, str):
+                await websocket.send_text(payload)
+            else:
+                await websocket.send_json(payload)
+
     try:
         while True:
             data = await websocket.receive_json()
+            request_id = data.get("request_id")
+
+            if data.get("type") == "cancel":
+                task = tasks.get(request_id)
+                if task is None:
+                    await send(
+                        {"error": "Unknown request_id", "request_id": request_id}
+                    )
+                else:
+                    task.cancel()
+                continue
 
             if "message" not in data or "philosopher_id" not in data:
-                await websocket.send_json(
-                    {
-                        "error": "Invalid message format. Required fields: 'message' and 'philosopher_id'"
-                    }
+                await send(
+                    __tag(
+                        {
+                            "error": "Invalid message format. Required fields: 'message' and 'philosopher_id'"
+                        },
+                        request_id,
+                    )
                 )
                 continue
 
-            try:
-                philosopher_factory = PhilosopherFactory()
-                philosopher = philosopher_factory.get_philosopher(
-                    data["philosopher_id"]
+            retry_after = session_manager.check_rate_limit(
+                __rate_limit_key(data.get("user_id"), websocket), EndpointClass.CHAT
+            )
+            if retry_after:
+                await send(
+                    __tag(
+                        {
+                            "error": "Rate limit exceeded, please retry later.",
+                            "status": 429,
+                            "retry_after": math.ceil(retry_after),
+                        },
+                        request_id,
+                    )
                 )
+                continue
 
-                # Use streaming response instead of get_response
-                response_stream = get_streaming_response(
-                    messages=data["message"],
-                    philosopher_id=data["philosopher_id"],
-                    philosopher_name=philosopher.name,
-                    philosopher_perspective=philosopher.perspective,
-                    philosopher_style=philosopher.style,
-                    philosopher_greeting=philosopher.greeting,
-                    philosopher_context="",
-                    user_id=data.get("user_id"),
+            if request_id is None:
+                untagged_task = asyncio.create_task(
+                    __stream_after(untagged_task, send, data)
                 )
+                untagged_tasks.add(untagged_task)
+                untagged_task.add_done_callback(untagged_tasks.discard)
+                continue
+
+            if request_id in tasks:
+                await send(
+                    {"error": "request_id is already in flight", "request_id": request_id}
+                )
+                continue
+            if len(tasks) >= settings.WS_MAX_CONCURRENT_REQUESTS:
+                await send(
+                    {"error": "Too many concurrent requests", "request_id": request_id}
+                )
+                continue
+
+            task = asyncio.create_task(__stream_chat_response(send, data))
+            tasks[request_id] = task
+            task.add_done_callback(lambda _, request_id=request_id: tasks.pop(request_id))
+
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pending = [*tasks.values(), *untagged_tasks]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+async def __stream_after(
+    previous: Optional[asyncio.Task],
+    send: Callable[[dict | str], Awaitable[None]],
+    data: dict,
+) -> None:
+    if previous is not None:
+        await asyncio.wait([previous])
+
+    await __stream_chat_response(send, data)
 
-                # Send initial message to indicate streaming has started
-                await websocket.send_json({"streaming": True})
 
-                # Stream each chunk of the response
-                full_response = ""
-                async for chunk in response_stream:
-                    full_response += chunk
-                    await websocket.send_json({"chunk": chunk})
+async def __stream_chat_response(
+    send: Callable[[dict | str], Awaitable[None]], data: dict
+) -> None:
+    request_id = data.get("request_id")
 
-                await websocket.send_json(
-                    {"response": full_response, "streaming": False}
+    try:
+        philosopher_factory = PhilosopherFactory()
+        philosopher = philosopher_factory.get_philosopher(data["philosopher_id"])
+
+        # Use streaming response instead of get_response
+        response_stream = get_streaming_response(
+            messages=data["message"],
+            philosopher_id=data["philosopher_id"],
+            philosopher_name=philosopher.name,
+            philosopher_perspective=philosopher.perspective,
+            philosopher_style=philosopher.style,
+            philosopher_greeting=philosopher.greeting,
+            philosopher_context="",
+            user_id=data.get("user_id"),
+            priority=Priority.INTERACTIVE,
+        )
+
+        # Send initial message to indicate streaming has started
+        await send(__tag({"streaming": True}, request_id))
+
+        # Stream the response in batches of chunks to limit the number of frames.
+        # Closing the streams on exit stops the graph run as soon as it is cancelled.
+        compact = data.get("compact", settings.WS_STREAM_COMPACT_FRAMES)
+        response_parts = []
+        async with (
+            aclosing(response_stream),
+            aclosing(
+                coalesce_chunks(
+                    response_stream,
+                    flush_interval_ms=settings.WS_STREAM_FLUSH_INTERVAL_MS,
+                    flush_chars=settings.WS_STREAM_FLUSH_CHARS,
                 )
+            ) as chunks,
+        ):
+            async for chunk in chunks:
+                response_parts.append(chunk)
+                await send(encode_chunk_frame(chunk, compact, request_id))
+
+        await send(
+            __tag(
+                {"response": "".join(response_parts), "streaming": False}, request_id
+            )
+        )
 
-            except Exception as e:
-                opik_tracer = OpikTracer()
-                opik_tracer.flush()
+    except asyncio.CancelledError:
+        with suppress(Exception):
+            await send(__tag({"cancelled": True, "streaming": False}, request_id))
+        raise
 
-                await websocket.send_json({"error": str(e)})
+    except AdmissionRejectedError as e:
+        with suppress(Exception):
+            await send(__tag({"error": str(e), "status": 429}, request_id))
 
-    except WebSocketDisconnect:
-        pass
+    except Exception as e:
+        trace_exporter.request_flush()
+
+        with suppress(Exception):
+            await send(__tag({"error": str(e)}, request_id))
+
+
+def __tag(payload: dict, request_id: Optional[str]) -> dict:
+    if request_id is not None:
+        payload["request_id"] = request_id
+
+    return payload
+
+
+def __rate_limit_key(user_id: Optional[str], connection: Request | WebSocket) -> str:
+    # Requests without a user ID are limited per client address.
+    if user_id:
+        return user_id
+
+    return f"address:{connection.client.host if connection.client else 'unknown'}"
+
+
+def __enforce_rate_limit(
+    user_id: Optional[str],
+    connection: Request | WebSocket,
+    endpoint_class: EndpointClass,
+) -> None:
+    retry_after = session_manager.check_rate_limit(
+        __rate_limit_key(user_id, connection), endpoint_class
+    )
+    if retry_after:
+        raise HTTPException(
+            status_code=429,
+            detail="Rate limit exceeded, please retry later.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+
+async def __wait_for_rate_limit(key: str, endpoint_class: EndpointClass) -> None:
+    while retry_after := session_manager.check_rate_limit(key, endpoint_class):
+        await asyncio.sleep(retry_after)
 
 
 class ResetRequest(BaseModel):
@@ -159,20 +543,37 @@ class ResetRequest(BaseModel):
 
 
 @app.post("/reset-memory")
-async def reset_conversation(request: ResetRequest = ResetRequest()):
+async def reset_conversation(
+    http_request: Request, request: ResetRequest = ResetRequest()
+):
     """Resets the conversation state.
 
     If user_id is provided, resets only that user's conversations.
-    If user_id is None, resets all conversations (admin function).
+    If user_id is None, resets all conversations (admin function) in a background job,
+    whose status is polled from `/reset-memory/jobs/{job_id}`.
 
     Args:
         request: Request body containing optional user_id
 
     Raises:
-        HTTPException: If there is an error resetting the conversation state.
+        HTTPException: If the rate limit is exceeded or there is an error resetting
+            the conversation state.
     Returns:
-        dict: A dictionary containing the result of the reset operation.
+        dict: A dictionary containing the result of the reset operation, or the
+            started job with a 202 status code.
     """
+    __enforce_rate_limit(request.user_id, http_request, EndpointClass.RESET)
+
+    if request.user_id is None:
+        job = reset_jobs.start()
+        return JSONResponse(
+            status_code=202,
+            content={
+                **job.to_dict(),
+                "status_url": f"/reset-memory/jobs/{job.job_id}",
+            },
+        )
+
     try:
         result = await reset_conversation_state(user_id=request.user_id)
         return result
@@ -180,6 +581,41 @@ async def reset_conversation(request: ResetRequest = ResetRequest()):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/reset-memory/jobs/{job_id}")
+async def get_reset_job(job_id: str):
+    """Returns the status of a background reset of all conversations.
+
+    Raises:
+        HTTPException: If the job is unknown or no longer tracked.
+    """
+    job = reset_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown reset job")
+
+    return job.to_dict()
+
+
+@app.get("/metrics")
+async def metrics():
+    """Returns the runtime metrics of the API.
+
+    Returns:
+        dict: Metrics grouped by component.
+    """
+    return {
+        "admission": admission_controller.stats(),
+        "llm_scheduler": llm_scheduler.stats(),
+        "checkpoint_cache": checkpoint_cache.stats(),
+        "checkpoint_compaction": checkpoint_compactor.stats(),
+        "checkpoint_write_behind": conversation_runtime.write_behind_stats(),
+        "rate_limits": session_manager.get_rate_limit_stats(),
+        "response_cache": response_cache.stats(),
+        "retrieval_cache": retrieval_cache.stats(),
+        "embedding_cache": get_embedding_cache_stats(),
+        "sse": {"time_to_first_token_seconds": sse_time_to_first_token.snapshot()},
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
 
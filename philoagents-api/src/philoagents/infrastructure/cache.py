@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheEntry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+
+
+class TTLCache(Generic[K, V]):
+    """Thread-safe LRU cache with a per-entry TTL, bounded by entry count and bytes.
+
+    Args:
+        max_bytes (int): Maximum total size of the cached values, in bytes.
+        ttl_seconds (float): Seconds an entry stays valid after it is stored.
+        max_entries (int, optional): Maximum number of entries. Unbounded if None.
+        sizeof (Callable[[V], int], optional): Estimates the size of a value in bytes.
+            Defaults to a size of 1 per entry.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        ttl_seconds: float,
+        max_entries: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.sizeof = sizeof or (lambda value: 1)
+
+        self._entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """Get a value and mark it as recently used.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            Optional[V]: The cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry.expires_at <= time.monotonic():
+                self.__remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry.value
+
+    def put(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entries to stay in bounds.
+
+        Values larger than the whole cache are not stored.
+
+        Args:
+            key: The cache key.
+            value: The value to cache.
+        """
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self.__remove(key)
+
+            self._entries[key] = CacheEntry(
+                value=value,
+                size=size,
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+            self._bytes += size
+
+            while self._bytes > self.max_bytes or (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                self.__remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Remove a single entry, if present."""
+        with self._lock:
+            if key in self._entries:
+                self.__remove(key)
+
+    def invalidate_where(self, predicate: Callable[[K], bool]) -> int:
+        """Remove every entry whose key matches the predicate.
+
+        Args:
+            predicate: Returns True for the keys to remove.
+
+        Returns:
+            int: The number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self.__remove(key)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Get the cache metrics.
+
+        Returns:
+            dict: Hits, misses, hit rate, evictions, expirations, entries and bytes.
+        """
+        lookups = self.hits + self.misses
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __remove(self, key: K) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
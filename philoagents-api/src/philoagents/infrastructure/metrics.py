@@ -0,0 +1,40 @@
+import bisect
+from typing import Sequence
+
+LATENCY_BUCKETS_SECONDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SIZE_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class Histogram:
+    """Fixed-bucket histogram, reported with cumulative counts like Prometheus.
+
+    Args:
+        buckets (Sequence[float]): The sorted upper bounds of the buckets.
+    """
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a value."""
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> dict:
+        """Get the histogram metrics.
+
+        Returns:
+            dict: The count and sum of the values, and the cumulative count of values
+                lower than or equal to each bucket bound.
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self._counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
@@ -1,4 +1,11 @@
 from .client import MongoClientWrapper
-from .indexes import MongoIndex
+from .indexes import INDEX_SPECS, HotQuery, IndexSpec, MongoIndex, QueryPlan
 
-__all__ = ["MongoClientWrapper", "MongoIndex"]
+__all__ = [
+    "MongoClientWrapper",
+    "MongoIndex",
+    "IndexSpec",
+    "HotQuery",
+    "QueryPlan",
+    "INDEX_SPECS",
+]
@@ -1,7 +1,94 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional, Sequence
+
 from langchain_mongodb.index import create_fulltext_search_index
+from loguru import logger
+from pymongo.asynchronous.database import AsyncDatabase
+
+from philoagents.config import settings
 
 from .client import MongoClientWrapper
 
+IndexKeys = tuple[tuple[str, int], ...]
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """A secondary index of a collection.
+
+    Args:
+        collection: Name of the collection.
+        keys: The indexed fields and their directions, in `create_index` format.
+        unique: Whether the index rejects duplicate keys.
+        expire_after_seconds: Makes a TTL index deleting documents this long after the
+            date in the indexed field.
+    """
+
+    collection: str
+    keys: IndexKeys
+    unique: bool = False
+    expire_after_seconds: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class HotQuery:
+    """A query on the request path of the API, which must be served by an index.
+
+    Args:
+        name: Human readable name of the query.
+        collection: Name of the queried collection.
+        filter: The query filter.
+        sort: Optional sort, in `find` format.
+        limit: Maximum number of documents returned, or 0 for no limit.
+    """
+
+    name: str
+    collection: str
+    filter: dict = field(hash=False)
+    sort: Optional[IndexKeys] = None
+    limit: int = 0
+
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """The stages of the plan MongoDB picked for a hot query."""
+
+    query: HotQuery
+    stages: tuple[str, ...]
+
+    @property
+    def is_collection_scan(self) -> bool:
+        """Whether the plan reads the whole collection instead of an index."""
+        return "COLLSCAN" in self.stages
+
+
+# The checkpointer indexes are declared exactly as `AsyncMongoDBSaver` creates them, so
+# provisioning them first is a no-op for it. The long-term memory collection is only
+# queried through its Atlas Search indexes, created by `MongoIndex.create` on ingestion.
+INDEX_SPECS: tuple[IndexSpec, ...] = (
+    IndexSpec(
+        collection=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+        keys=(("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)),
+        unique=True,
+    ),
+    IndexSpec(
+        collection=settings.MONGO_STATE_WRITES_COLLECTION,
+        keys=(
+            ("thread_id", 1),
+            ("checkpoint_ns", 1),
+            ("checkpoint_id", -1),
+            ("task_id", 1),
+            ("idx", 1),
+        ),
+        unique=True,
+    ),
+    IndexSpec(
+        collection=settings.MONGO_SESSIONS_COLLECTION,
+        keys=(("last_activity", 1),),
+        expire_after_seconds=settings.SESSION_TIMEOUT_MINUTES * 60,
+    ),
+)
+
 
 class MongoIndex:
     def __init__(
@@ -28,3 +115,113 @@ class MongoIndex:
                 field=vectorstore._text_key,
                 index_name=self.retriever.search_index_name,
             )
+
+    @staticmethod
+    async def provision(
+        database: AsyncDatabase, specs: Sequence[IndexSpec] = INDEX_SPECS
+    ) -> list[IndexSpec]:
+        """Create the declared indexes missing from the database.
+
+        Indexes are matched on their keys, so running it again, or after the
+        checkpointer created its own indexes, changes nothing. The expiry of an existing
+        TTL index is updated if it differs from the spec.
+
+        Args:
+            database: The database holding the collections.
+            specs: The indexes to provision.
+
+        Returns:
+            list[IndexSpec]: The indexes that were created.
+        """
+        created = []
+        for spec in specs:
+            collection = database[spec.collection]
+            existing = {
+                MongoIndex.__keys_of(index): index
+                for index in await (await collection.list_indexes()).to_list()
+            }
+
+            index = existing.get(spec.keys)
+            if index is None:
+                options: dict[str, Any] = {"unique": spec.unique}
+                if spec.expire_after_seconds is not None:
+                    options["expireAfterSeconds"] = spec.expire_after_seconds
+                name = await collection.create_index(list(spec.keys), **options)
+                created.append(spec)
+                logger.info(f"Created index {name} on {spec.collection}")
+                continue
+
+            if bool(index.get("unique", False)) != spec.unique:
+                logger.warning(
+                    f"Index {index['name']} on {spec.collection} should have unique={spec.unique}. "
+                    "Drop it to have it recreated."
+                )
+            if (
+                spec.expire_after_seconds is not None
+                and index.get("expireAfterSeconds") != spec.expire_after_seconds
+            ):
+                await database.command(
+                    "collMod",
+                    spec.collection,
+                    index={
+                        "keyPattern": dict(spec.keys),
+                        "expireAfterSeconds": spec.expire_after_seconds,
+                    },
+                )
+                logger.info(
+                    f"Updated the expiry of index {index['name']} on {spec.collection} "
+                    f"to {spec.expire_after_seconds}s"
+                )
+
+        return created
+
+    @staticmethod
+    async def explain(
+        database: AsyncDatabase, queries: Sequence[HotQuery]
+    ) -> list[QueryPlan]:
+        """Get the plans MongoDB picks for queries, without running them.
+
+        Args:
+            database: The database holding the collections.
+            queries: The queries to explain.
+
+        Returns:
+            list[QueryPlan]: The stages of the winning plan of every query.
+        """
+        plans = []
+        for query in queries:
+            find: dict[str, Any] = {"find": query.collection, "filter": query.filter}
+            if query.sort:
+                find["sort"] = dict(query.sort)
+            if query.limit:
+                find["limit"] = query.limit
+            explanation = await database.command(
+                {"explain": find, "verbosity": "queryPlanner"}
+            )
+            stages = MongoIndex.__stages_of(explanation["queryPlanner"]["winningPlan"])
+            plans.append(QueryPlan(query=query, stages=tuple(stages)))
+
+        return plans
+
+    @staticmethod
+    def __keys_of(index: dict) -> IndexKeys:
+        return tuple(
+            (name, int(direction))
+            if isinstance(direction, (int, float))
+            else (name, direction)
+            for name, direction in index["key"].items()
+        )
+
+    @staticmethod
+    def __stages_of(plan: Any) -> list[str]:
+        # Plans are trees of stages, nested differently by query engines and sharding.
+        if isinstance(plan, list):
+            return [stage for child in plan for stage in MongoIndex.__stages_of(child)]
+        if not isinstance(plan, dict):
+            return []
+
+        stages = [plan["stage"]] if "stage" in plan else []
+        for value in plan.values():
+            stages.extend(MongoIndex.__stages_of(value))
+
+        return stages
@@ -1,8 +1,14 @@
 import os
+import queue
+import random
+import threading
+from typing import Optional
 
 import opik
+from langchain_core.runnables.graph import Graph
 from loguru import logger
 from opik.configurator.configure import OpikConfigurator
+from opik.integrations.langchain import OpikTracer
 
 from philoagents.config import settings
 
@@ -59,3 +65,113 @@ def create_dataset(name: str, description: str, items: list[dict]) -> opik.Datas
     dataset.insert(items)
 
     return dataset
+
+
+def get_opik_tracer(graph: Graph) -> OpikTracer | None:
+    """Create an Opik tracer for a single graph run, honoring the trace sampling rate.
+
+    Args:
+        graph: The precomputed (xray) topology of the traced graph.
+
+    Returns:
+        OpikTracer | None: A tracer if this run is sampled and Opik is configured,
+            None otherwise.
+    """
+    if not settings.COMET_API_KEY:
+        return None
+
+    if random.random() >= settings.OPIK_TRACE_SAMPLING_RATE:
+        return None
+
+    return OpikTracer(graph=graph)
+
+
+class TraceExporter:
+    """Flushes Opik traces from a background thread so requests never wait on Comet.
+
+    Flush requests are put on a bounded queue and dropped when it is full, which keeps
+    memory and latency bounded even when the Opik backend is slow or unreachable.
+
+    Args:
+        max_queue_size: Maximum number of pending flush requests.
+        flush_timeout: Maximum seconds to wait for a single flush.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_queue_size: int, flush_timeout: int) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._flush_timeout = flush_timeout
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped_count = 0
+
+    def start(self) -> None:
+        """Start the background exporter thread if it is not already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+
+            self._thread = threading.Thread(
+                target=self.__run, name="opik-trace-exporter", daemon=True
+            )
+            self._thread.start()
+
+    def request_flush(self) -> bool:
+        """Schedule a flush of all pending traces without blocking the caller.
+
+        Returns:
+            bool: True if the request was queued, False if it was dropped.
+        """
+        if not settings.COMET_API_KEY:
+            return False
+
+        self.start()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            self.dropped_count += 1
+            return False
+
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Export the remaining traces and stop the exporter thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the exporter to finish.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.warning("Trace exporter queue is full. Skipping final Opik flush.")
+            return
+
+        self._thread.join(timeout)
+
+    def __run(self) -> None:
+        while True:
+            item = self._queue.get()
+            # Collapse queued requests: a single flush exports everything pending.
+            while item is not self._STOP:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                opik.flush_tracker(timeout=self._flush_timeout)
+            except Exception as e:
+                logger.warning(f"Failed to flush Opik traces: {e}")
+
+            if item is self._STOP:
+                return
+
+
+trace_exporter = TraceExporter(
+    max_queue_size=settings.OPIK_EXPORT_QUEUE_SIZE,
+    flush_timeout=settings.OPIK_FLUSH_TIMEOUT_SECONDS,
+)
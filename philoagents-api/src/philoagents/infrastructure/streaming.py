@@ -0,0 +1,159 @@
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+_END_OF_STREAM = object()
+
+
+async def coalesce_chunks(
+    stream: AsyncIterator[str], flush_interval_ms: float, flush_chars: int
+) -> AsyncIterator[str]:
+    """Batches the chunks of a token stream into fewer, larger chunks.
+
+    The source stream is consumed by a background task, so a batch is flushed as soon
+    as it holds `flush_chars` characters or `flush_interval_ms` milliseconds have passed
+    since its first chunk, even if the source is stalled, e.g., while a tool runs.
+
+    Args:
+        stream: The source stream of chunks.
+        flush_interval_ms: Maximum time a chunk waits before being flushed. Chunks are
+            forwarded one by one if it is 0.
+        flush_chars: Number of buffered characters that triggers a flush.
+
+    Yields:
+        str: The concatenated chunks of each batch.
+
+    Raises:
+        Exception: Any exception raised by the source stream, after the chunks received
+            before it were flushed.
+    """
+    if flush_interval_ms <= 0:
+        async for chunk in stream:
+            yield chunk
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    pump = asyncio.create_task(__pump(stream, queue))
+    flush_interval = flush_interval_ms / 1000
+
+    try:
+        finished = False
+        while not finished:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, BaseException):
+                raise item
+
+            buffer = [item]
+            size = len(item)
+            error = None
+            try:
+                # A single timer per batch, rather than one per awaited chunk.
+                async with asyncio.timeout(flush_interval):
+                    while size < flush_chars:
+                        item = await queue.get()
+                        if item is _END_OF_STREAM:
+                            finished = True
+                            break
+                        if isinstance(item, BaseException):
+                            error = item
+                            break
+
+                        buffer.append(item)
+                        size += len(item)
+            except TimeoutError:
+                pass
+
+            yield "".join(buffer)
+
+            if error is not None:
+                raise error
+    finally:
+        pump.cancel()
+        await asyncio.wait([pump])
+
+
+async def __pump(stream: AsyncIterator[str], queue: asyncio.Queue) -> None:
+    try:
+        async for chunk in stream:
+            if chunk:
+                queue.put_nowait(chunk)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        queue.put_nowait(e)
+    else:
+        queue.put_nowait(_END_OF_STREAM)
+
+
+def encode_chunk_frame(
+    chunk: str, compact: bool = False, request_id: Optional[str] = None
+) -> str:
+    """Encodes a streamed chunk as a WebSocket text frame.
+
+    Args:
+        chunk: The chunk of the response.
+        compact: Whether to use the compact `{"c": ...}` frame instead of the
+            `{"chunk": ...}` frame.
+        request_id: The request the chunk belongs to, added to the frame if set.
+
+    Returns:
+        str: The JSON-encoded frame.
+    """
+    frame = {"c": chunk} if compact else {"chunk": chunk}
+    if request_id is not None:
+        frame["request_id"] = request_id
+
+    return json.dumps(frame, ensure_ascii=False, separators=(",", ":"))
+
+
+async def with_heartbeats(
+    stream: AsyncIterator[str], interval_seconds: float
+) -> AsyncIterator[Optional[str]]:
+    """Forwards the chunks of a stream, yielding None whenever it stays idle too long.
+
+    Args:
+        stream: The source stream of chunks.
+        interval_seconds: Idle time after which a heartbeat is yielded.
+
+    Yields:
+        Optional[str]: The chunks of the stream, or None for a heartbeat.
+    """
+    iterator = aiter(stream)
+    next_chunk = asyncio.ensure_future(anext(iterator))
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_chunk}, timeout=interval_seconds)
+            if not done:
+                yield None
+                continue
+
+            try:
+                chunk = next_chunk.result()
+            except StopAsyncIteration:
+                return
+
+            yield chunk
+            next_chunk = asyncio.ensure_future(anext(iterator))
+    finally:
+        next_chunk.cancel()
+        await asyncio.wait([next_chunk])
+
+
+def encode_sse_event(event: str, data: dict) -> str:
+    """Encodes a Server-Sent Event with a JSON payload.
+
+    Args:
+        event: The event type.
+        data: The payload of the event.
+
+    Returns:
+        str: The encoded event.
+    """
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+SSE_HEARTBEAT = ": heartbeat\n\n"
@@ -0,0 +1,4 @@
+import os
+
+# The settings require a Groq API key, which the unit tests never use.
+os.environ.setdefault("GROQ_API_KEY", "test")
@@ -0,0 +1,35 @@
+import asyncio
+
+from philoagents.application.conversation_service.admission import (
+    AdmissionController,
+)
+
+
+async def hold_slot(controller: AdmissionController) -> None:
+    async with controller.admit():
+        await asyncio.sleep(60)
+
+
+def test_cancelling_holder_and_waiter_together_propagates_cancellation():
+    async def scenario() -> tuple[list, AdmissionController]:
+        controller = AdmissionController(
+            max_in_flight=1, max_queue_size=10, queue_timeout_seconds=60
+        )
+        controller.start()
+        holder = asyncio.create_task(hold_slot(controller))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold_slot(controller))
+        await asyncio.sleep(0)
+
+        # Like a WebSocket disconnect cancelling every in-flight request.
+        holder.cancel()
+        waiter.cancel()
+        results = await asyncio.gather(holder, waiter, return_exceptions=True)
+
+        return results, controller
+
+    results, controller = asyncio.run(scenario())
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert controller.stats()["in_flight"] == 0
+    assert controller.stats()["queued"] == 0
@@ -0,0 +1,35 @@
+import asyncio
+
+from philoagents.application.conversation_service.scheduler import LLMScheduler
+
+
+async def hold_slot(scheduler: LLMScheduler, seconds: float = 60) -> None:
+    async with scheduler.slot():
+        await asyncio.sleep(seconds)
+
+
+def test_cancelling_holder_and_queued_call_together_frees_the_slot():
+    async def scenario() -> tuple[list, LLMScheduler]:
+        scheduler = LLMScheduler(max_concurrency=1)
+        scheduler.start()
+        holder = asyncio.create_task(hold_slot(scheduler))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(hold_slot(scheduler))
+        await asyncio.sleep(0)
+
+        # Like a WebSocket disconnect cancelling every in-flight request.
+        holder.cancel()
+        queued.cancel()
+        results = await asyncio.gather(holder, queued, return_exceptions=True)
+
+        # The slot must be available to the next call.
+        await asyncio.wait_for(hold_slot(scheduler, seconds=0), timeout=1)
+
+        return results, scheduler
+
+    results, scheduler = asyncio.run(scenario())
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    stats = scheduler.stats()
+    assert stats["running"] == 0
+    assert all(cls["queued"] == 0 for cls in stats["classes"].values())
@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime
+from typing import Optional
+
+from philoagents.application.session_service.backends import SessionBackend
+from philoagents.application.session_service.session_manager import SessionManager
+
+
+class DictSessionBackend(SessionBackend):
+    def __init__(self) -> None:
+        self.sessions: dict[str, datetime] = {}
+
+    def create(self, user_id: str, created_at: datetime) -> None:
+        self.sessions[user_id] = created_at
+
+    def refresh(self, user_id: str, timeout_minutes: int) -> Optional[datetime]:
+        return self.sessions.get(user_id)
+
+    def delete(self, user_id: str) -> bool:
+        return self.sessions.pop(user_id, None) is not None
+
+    def count(self) -> int:
+        return len(self.sessions)
+
+
+def test_in_memory_session_api_is_synchronous():
+    manager = SessionManager()
+
+    session = manager.get_or_create_session("user")
+
+    assert manager.get_session("user") is session
+    assert manager.get_active_session_count() == 1
+    assert manager.invalidate_session("user") is True
+    assert manager.get_session("user") is None
+
+
+def test_async_session_api_uses_the_backend():
+    backend = DictSessionBackend()
+    manager = SessionManager(backend=backend, near_cache_ttl_seconds=0)
+
+    async def scenario() -> None:
+        session = await manager.aget_or_create_session("user")
+        assert "user" in backend.sessions
+
+        refreshed = await manager.aget_session("user")
+        assert refreshed is not None
+        assert refreshed.user_id == session.user_id
+        assert await manager.aget_active_session_count() == 1
+
+        assert await manager.ainvalidate_session("user") is True
+        assert await manager.aget_session("user") is None
+
+    asyncio.run(scenario())
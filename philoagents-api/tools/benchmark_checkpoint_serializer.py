@@ -0,0 +1,101 @@
+import random
+import time
+
+import click
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.checkpoint.base import empty_checkpoint
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from philoagents.application.conversation_service.checkpoint_serializer import (
+    CompressedSerializer,
+)
+from philoagents.domain.philosopher_factory import PhilosopherFactory
+
+WORDS = (
+    "the mind machine think reason truth knowledge question answer language logic "
+    "virtue soul world meaning human intelligence being nature ethics know believe "
+    "perhaps indeed consider argue evidence experience sense idea learn understand"
+).split()
+
+
+def sentence(rng: random.Random, nb_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(nb_words)).capitalize() + "."
+
+
+def build_checkpoint(nb_messages: int, seed: int = 0) -> dict:
+    """Builds the checkpoint of a conversation thread with `nb_messages` messages.
+
+    User messages are about 30 words long and philosopher replies about 120 words,
+    next to the philosopher fields and a retrieved context stored in the state.
+    """
+    rng = random.Random(seed)
+    philosopher = PhilosopherFactory.get_philosopher("socrates")
+    messages = [
+        HumanMessage(content=sentence(rng, 30))
+        if idx % 2 == 0
+        else AIMessage(content=" ".join(sentence(rng, 12) for _ in range(10)))
+        for idx in range(nb_messages)
+    ]
+
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {
+        "messages": messages,
+        "philosopher_context": " ".join(sentence(rng, 20) for _ in range(15)),
+        "philosopher_name": philosopher.name,
+        "philosopher_perspective": philosopher.perspective,
+        "philosopher_style": philosopher.style,
+        "philosopher_greeting": philosopher.greeting,
+        "summary": "",
+    }
+
+    return checkpoint
+
+
+def benchmark(name: str, serde, checkpoint: dict, iterations: int) -> int:
+    type_, payload = serde.dumps_typed(checkpoint)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serde.dumps_typed(checkpoint)
+    encode = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serde.loads_typed((type_, payload))
+    decode = (time.perf_counter() - start) / iterations
+
+    print(
+        f"{name:<12} {len(payload):9,} bytes | "
+        f"encode {encode * 1e6:8.1f} us | decode {decode * 1e6:8.1f} us"
+    )
+
+    return len(payload)
+
+
+@click.command()
+@click.option("--messages", default=30, type=int, help="Messages per thread.")
+@click.option("--iterations", default=200, type=int, help="Encodings per serializer.")
+def main(messages: int, iterations: int) -> None:
+    """Benchmark the size and speed of the checkpoint serializers.
+
+    Args:
+        messages: Messages per thread.
+        iterations: Encodings per serializer.
+    """
+    checkpoint = build_checkpoint(messages)
+    plain = JsonPlusSerializer()
+
+    baseline = benchmark("msgpack", plain, checkpoint, iterations)
+    for codec, level in (("zlib", 6), ("zstd", 1), ("zstd", 3), ("zstd", 9)):
+        serde = CompressedSerializer(plain, codec=codec, level=level)
+        size = benchmark(f"{codec}-{level}", serde, checkpoint, iterations)
+        print(f"{'':<12} {baseline / size:9.2f}x smaller")
+
+    # Checkpoints stored without compression must stay readable.
+    legacy = plain.dumps_typed(checkpoint)
+    restored = CompressedSerializer(plain).loads_typed(legacy)
+    assert restored["channel_values"] == checkpoint["channel_values"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import statistics
+import time
+from functools import wraps
+from pathlib import Path
+
+import click
+import numpy as np
+from loguru import logger
+
+from philoagents.application import LongTermMemoryRetriever
+from philoagents.application.conversation_service.workflow.chains import (
+    get_context_summary_chain,
+)
+from philoagents.application.rag import get_context_compressor
+from philoagents.config import settings
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+
+    return float(a @ b / max(np.linalg.norm(a) * np.linalg.norm(b), 1e-12))
+
+
+def report(
+    name: str, latencies: list[float], qualities: list[float], tokens: list[int]
+) -> None:
+    print(
+        f"{name:<12} latency p50={statistics.median(latencies):8.1f} ms | "
+        f"mean={statistics.mean(latencies):8.1f} ms | "
+        f"answer similarity={statistics.mean(qualities):.3f} | "
+        f"tokens={statistics.mean(tokens):6.1f}"
+    )
+
+
+@click.command()
+@click.option(
+    "--data-path",
+    type=click.Path(exists=True, path_type=Path),
+    default=settings.EVALUATION_DATASET_FILE_PATH,
+    help="Path to the evaluation dataset file.",
+)
+@click.option(
+    "--nb-samples", default=20, type=int, help="Number of samples to benchmark."
+)
+@click.option(
+    "--token-budget",
+    default=settings.RAG_CONTEXT_TOKEN_BUDGET,
+    type=int,
+    help="Token budget of the extractive compressor.",
+)
+@async_command
+async def main(data_path: Path, nb_samples: int, token_budget: int) -> None:
+    """Compare the LLM context summarizer against local extractive compression.
+
+    For every sample, the context is retrieved for the first user question and
+    compressed by both strategies. Answer quality is approximated by the cosine
+    similarity between the compressed context and the reference answer of the
+    dataset, i.e. how much of the reference answer the context still supports.
+
+    Args:
+        data_path: Path to the evaluation dataset file.
+        nb_samples: Number of samples to benchmark.
+        token_budget: Token budget of the extractive compressor.
+    """
+    with open(data_path, "r") as f:
+        samples = json.load(f)["samples"][:nb_samples]
+
+    retriever = LongTermMemoryRetriever.build_from_settings()
+    embedding_model = retriever.retriever.vectorstore.embeddings
+    compressor = get_context_compressor(embedding_model, token_budget)
+    context_summary_chain = get_context_summary_chain()
+
+    results = {"llm": ([], [], []), "extractive": ([], [], [])}
+    for sample in samples:
+        query = sample["messages"][0]["content"]
+        reference = sample["messages"][1]["content"]
+        context = "\n\n".join(doc.page_content for doc in retriever(query))
+        reference_embedding = embedding_model.embed_query(reference)
+
+        start = time.perf_counter()
+        response = await context_summary_chain.ainvoke({"context": context})
+        llm_latency = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        compressed = compressor(query, context)
+        extractive_latency = (time.perf_counter() - start) * 1000
+
+        for name, text, latency in (
+            ("llm", response.content, llm_latency),
+            ("extractive", compressed, extractive_latency),
+        ):
+            latencies, qualities, tokens = results[name]
+            latencies.append(latency)
+            qualities.append(
+                cosine_similarity(
+                    embedding_model.embed_query(text), reference_embedding
+                )
+            )
+            tokens.append(len(compressor.encoding.encode(text)))
+
+    logger.info(f"Benchmarked {len(samples)} samples from '{data_path}'.")
+    for name, (latencies, qualities, tokens) in results.items():
+        report(name, latencies, qualities, tokens)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import asyncio
+import statistics
+import time
+from functools import wraps
+
+import click
+from langgraph.checkpoint.mongodb.aio import AsyncMongoDBSaver
+
+from philoagents.application.conversation_service.runtime import conversation_runtime
+from philoagents.application.conversation_service.workflow.graph import (
+    create_workflow_graph,
+)
+from philoagents.config import settings
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+async def per_request_setup_turn(config: dict) -> None:
+    """Replicates the previous per-turn setup: new checkpointer, new compile, state read."""
+    async with AsyncMongoDBSaver.from_conn_string(
+        conn_string=settings.MONGO_URI,
+        db_name=settings.MONGO_DB_NAME,
+        checkpoint_collection_name=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+        writes_collection_name=settings.MONGO_STATE_WRITES_COLLECTION,
+    ) as checkpointer:
+        graph = create_workflow_graph().compile(checkpointer=checkpointer)
+        await graph.aget_state(config)
+
+
+async def shared_runtime_turn(config: dict) -> None:
+    """Per-turn setup through the process-wide conversation runtime."""
+    async with conversation_runtime.acquire_graph() as graph:
+        await graph.aget_state(config)
+
+
+async def measure(turn, config: dict, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await turn(config)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[int(0.95 * (len(ordered) - 1))]
+    print(
+        f"{name:<22} p50={statistics.median(ordered):8.2f} ms | "
+        f"p95={p95:8.2f} ms | mean={statistics.mean(ordered):8.2f} ms"
+    )
+
+
+@click.command()
+@click.option(
+    "--iterations",
+    type=int,
+    default=50,
+    help="Number of simulated chat turns per strategy.",
+)
+@click.option(
+    "--thread-id",
+    type=str,
+    default="benchmark:runtime",
+    help="Thread ID whose latest checkpoint is read on every turn.",
+)
+@async_command
+async def main(iterations: int, thread_id: str) -> None:
+    """Benchmark the per-turn graph setup overhead before and after the shared runtime.
+
+    Both strategies read the latest checkpoint of the same thread, so the difference
+    between them is the cost of opening a checkpointer and compiling the graph.
+
+    Args:
+        iterations: Number of simulated chat turns per strategy.
+        thread_id: Thread ID whose latest checkpoint is read on every turn.
+    """
+    config = {"configurable": {"thread_id": thread_id}}
+
+    # Warm up imports, graph builder cache and server-side connection handling.
+    await per_request_setup_turn(config)
+
+    before = await measure(per_request_setup_turn, config, iterations)
+
+    await conversation_runtime.start()
+    try:
+        after = await measure(shared_runtime_turn, config, iterations)
+    finally:
+        await conversation_runtime.close()
+
+    report("per-request setup", before)
+    report("shared runtime", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import click
+from loguru import logger
+
+from philoagents.application.session_service.session_manager import (
+    SessionManager,
+    UserSession,
+)
+
+
+@dataclass
+class LegacyUserSession:
+    """Replicates the previous session representation."""
+
+    user_id: str
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    last_activity: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    is_active: bool = True
+
+    def update_activity(self) -> None:
+        self.last_activity = datetime.now(timezone.utc)
+
+    def is_expired(self, timeout_minutes: int = 60) -> bool:
+        timeout_delta = timedelta(minutes=timeout_minutes)
+        return datetime.now(timezone.utc) - self.last_activity > timeout_delta
+
+
+def timed(f, *args) -> float:
+    start = time.perf_counter()
+    f(*args)
+
+    return time.perf_counter() - start
+
+
+def legacy_full_scan(manager: SessionManager, timeout_minutes: int) -> list[str]:
+    """Replicates the previous cleanup, which checked every session."""
+    return [
+        user_id
+        for user_id, session in manager._sessions.items()
+        if session.is_expired(timeout_minutes)
+    ]
+
+
+def legacy_lookup_log(manager: SessionManager) -> str:
+    """Replicates the string built by the previous per-call logging."""
+    return f"Current sessions: {list(manager._sessions.keys())}"
+
+
+def benchmark_representation(
+    session_cls: type, user_ids: list[str], calls: int
+) -> None:
+    tracemalloc.start()
+    sessions = [session_cls(user_id=user_id) for user_id in user_ids]
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sample = sessions[:calls]
+    update = timed(lambda: [session.update_activity() for session in sample])
+    expired = timed(lambda: [session.is_expired(60) for session in sample])
+
+    print(
+        f"{session_cls.__name__:<18} {memory / len(sessions):7.1f} B/session | "
+        f"update_activity {update / len(sample) * 1e9:6.0f} ns | "
+        f"is_expired {expired / len(sample) * 1e9:6.0f} ns"
+    )
+
+
+def benchmark(size: int, lookups: int, expired_ratio: float) -> None:
+    manager = SessionManager(session_timeout_minutes=60)
+    user_ids = [f"user-{idx}" for idx in range(size)]
+
+    populate = timed(lambda: [manager.create_session(user_id) for user_id in user_ids])
+
+    sample = random.Random(0).choices(user_ids, k=lookups)
+    lookup = timed(
+        lambda: [manager.get_or_create_session(user_id) for user_id in sample]
+    )
+
+    legacy_log_calls = 5
+    legacy_log = timed(
+        lambda: [legacy_lookup_log(manager) for _ in range(legacy_log_calls)]
+    )
+
+    # Age the least recently used sessions past the timeout.
+    nb_expired = int(size * expired_ratio)
+    for session in list(manager._sessions.values())[:nb_expired]:
+        session.last_activity -= timedelta(minutes=61)
+
+    scan = timed(legacy_full_scan, manager, 60)
+    cleanup_start = time.perf_counter()
+    removed = manager.remove_expired_sessions()
+    cleanup = time.perf_counter() - cleanup_start
+    idle_cleanup = timed(manager.remove_expired_sessions)
+
+    print(f"--- {size:,} sessions ---")
+    print(f"create                {populate / size * 1e6:10.2f} us/op")
+    print(f"get_or_create         {lookup / lookups * 1e6:10.2f} us/op")
+    print(
+        f"previous lookup log   {legacy_log / legacy_log_calls * 1e6:10.2f} us/op (removed)"
+    )
+    print(f"previous cleanup scan {scan * 1000:10.2f} ms")
+    print(f"cleanup ({removed:,} expired) {cleanup * 1000:10.2f} ms")
+    print(f"cleanup (none expired) {idle_cleanup * 1e6:9.2f} us")
+
+    manager.shutdown()
+    for session_cls in (LegacyUserSession, UserSession):
+        benchmark_representation(session_cls, user_ids, min(size, lookups))
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    default="100000,1000000",
+    help="Comma-separated numbers of sessions to benchmark.",
+)
+@click.option("--lookups", default=100_000, type=int, help="Number of lookups.")
+@click.option(
+    "--expired-ratio",
+    default=0.1,
+    type=float,
+    help="Share of the sessions expired before the cleanup.",
+)
+def main(sizes: str, lookups: int, expired_ratio: float) -> None:
+    """Benchmark the session manager and the session footprint at large session counts.
+
+    Args:
+        sizes: Comma-separated numbers of sessions to benchmark.
+        lookups: Number of lookups.
+        expired_ratio: Share of the sessions expired before the cleanup.
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    for size in sizes.split(","):
+        benchmark(int(size), lookups, expired_ratio)
+
+
+if __name__ == "__main__":
+    main()
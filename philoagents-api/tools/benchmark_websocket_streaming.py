@@ -0,0 +1,171 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+from functools import wraps
+from typing import AsyncIterator
+
+import click
+
+from philoagents.config import settings
+from philoagents.infrastructure.streaming import coalesce_chunks, encode_chunk_frame
+
+WORDS = (
+    "the unexamined life is not worth living for a human being and virtue is "
+    "knowledge while wisdom begins in wonder so let us reason together about"
+).split()
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+class CountingWebSocket:
+    """Stands in for a WebSocket, encoding frames like Starlette and counting them."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_json(self, data: dict) -> None:
+        await self.send_text(
+            json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+        )
+
+    async def send_text(self, text: str) -> None:
+        self.frames += 1
+        self.bytes += len(text.encode("utf-8"))
+
+
+async def token_stream(tokens: list[str], token_delay_ms: float) -> AsyncIterator[str]:
+    for token in tokens:
+        await asyncio.sleep(token_delay_ms / 1000)
+        yield token
+
+
+async def per_token_frames(
+    websocket: CountingWebSocket, stream: AsyncIterator[str]
+) -> str:
+    """Replicates the previous behavior: one frame per token and string concatenation."""
+    full_response = ""
+    async for chunk in stream:
+        full_response += chunk
+        await websocket.send_json({"chunk": chunk})
+
+    return full_response
+
+
+async def coalesced_frames(
+    websocket: CountingWebSocket,
+    stream: AsyncIterator[str],
+    flush_interval_ms: float,
+    flush_chars: int,
+    compact: bool,
+) -> str:
+    response_parts = []
+    async for chunk in coalesce_chunks(stream, flush_interval_ms, flush_chars):
+        response_parts.append(chunk)
+        await websocket.send_text(encode_chunk_frame(chunk, compact))
+
+    return "".join(response_parts)
+
+
+async def measure(strategy, tokens: list[str], token_delay_ms: float, **kwargs) -> dict:
+    websocket = CountingWebSocket()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    response = await strategy(websocket, token_stream(tokens, token_delay_ms), **kwargs)
+    assert response == "".join(tokens)
+
+    return {
+        "frames": websocket.frames,
+        "bytes": websocket.bytes,
+        "cpu_ms": (time.process_time() - cpu_start) * 1000,
+        "wall_ms": (time.perf_counter() - wall_start) * 1000,
+    }
+
+
+def report(name: str, results: list[dict]) -> None:
+    print(
+        f"{name:<18} frames={statistics.mean(r['frames'] for r in results):7.1f} | "
+        f"bytes={statistics.mean(r['bytes'] for r in results):8.0f} | "
+        f"cpu={statistics.mean(r['cpu_ms'] for r in results):7.2f} ms | "
+        f"wall={statistics.mean(r['wall_ms'] for r in results):8.1f} ms  (per response)"
+    )
+
+
+@click.command()
+@click.option(
+    "--responses", default=20, type=int, help="Number of responses to stream."
+)
+@click.option("--tokens", default=400, type=int, help="Number of tokens per response.")
+@click.option(
+    "--token-delay-ms", default=2.0, type=float, help="Delay between two tokens."
+)
+@click.option(
+    "--flush-interval-ms",
+    default=settings.WS_STREAM_FLUSH_INTERVAL_MS,
+    type=float,
+    help="Maximum time a token is buffered before being flushed.",
+)
+@click.option(
+    "--flush-chars",
+    default=settings.WS_STREAM_FLUSH_CHARS,
+    type=int,
+    help="Number of buffered characters that triggers a flush.",
+)
+@async_command
+async def main(
+    responses: int,
+    tokens: int,
+    token_delay_ms: float,
+    flush_interval_ms: float,
+    flush_chars: int,
+) -> None:
+    """Compare the frames and CPU time spent per streamed response over the WebSocket.
+
+    Responses are synthetic token streams, so the benchmark runs without the LLM and
+    only measures the cost of framing, encoding and assembling the response.
+
+    Args:
+        responses: Number of responses to stream.
+        tokens: Number of tokens per response.
+        token_delay_ms: Delay between two tokens, mimicking the LLM throughput.
+        flush_interval_ms: Maximum time a token is buffered before being flushed.
+        flush_chars: Number of buffered characters that triggers a flush.
+    """
+    rng = random.Random(0)
+    samples = [
+        [f"{rng.choice(WORDS)} " for _ in range(tokens)] for _ in range(responses)
+    ]
+
+    results = {"per-token": [], "coalesced": [], "coalesced+compact": []}
+    for sample in samples:
+        results["per-token"].append(
+            await measure(per_token_frames, sample, token_delay_ms)
+        )
+        for name, compact in (("coalesced", False), ("coalesced+compact", True)):
+            results[name].append(
+                await measure(
+                    coalesced_frames,
+                    sample,
+                    token_delay_ms,
+                    flush_interval_ms=flush_interval_ms,
+                    flush_chars=flush_chars,
+                    compact=compact,
+                )
+            )
+
+    for name, measurements in results.items():
+        report(name, measurements)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import asyncio
+from functools import wraps
+from typing import Optional
+
+import click
+
+from philoagents.application.conversation_service.compaction import (
+    CheckpointCompactor,
+)
+from philoagents.config import settings
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+@click.command()
+@click.option(
+    "--keep-last",
+    default=settings.CHECKPOINT_RETENTION_KEEP_LAST,
+    type=click.IntRange(min=1),
+    help="Number of most recent checkpoints kept per conversation thread.",
+)
+@click.option(
+    "--idle-ttl-days",
+    default=settings.CHECKPOINT_RETENTION_IDLE_TTL_DAYS,
+    type=float,
+    help="Delete the conversation threads idle for longer than this many days.",
+)
+@async_command
+async def main(keep_last: int, idle_ttl_days: Optional[float]) -> None:
+    """CLI command to apply the checkpoint retention policy once.
+
+    Args:
+        keep_last: Number of most recent checkpoints kept per conversation thread.
+        idle_ttl_days: Delete the conversation threads idle for longer than this.
+    """
+    compactor = CheckpointCompactor(
+        keep_last=keep_last,
+        idle_ttl_seconds=idle_ttl_days * 86400 if idle_ttl_days is not None else None,
+    )
+    report = await compactor.compact()
+
+    print(f"Threads scanned:     {report.threads_scanned}")
+    print(f"Threads compacted:   {report.threads_compacted}")
+    print(f"Threads expired:     {report.threads_expired}")
+    print(f"Checkpoints deleted: {report.checkpoints_deleted}")
+    print(f"Writes deleted:      {report.writes_deleted}")
+    print(f"Bytes reclaimed:     {report.bytes_reclaimed:,}")
+    print(f"Duration:            {report.duration_seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timezone
+from functools import wraps
+
+import click
+from pymongo import AsyncMongoClient
+
+from philoagents.application.conversation_service.reset_conversation import (
+    user_thread_filter,
+)
+from philoagents.config import settings
+from philoagents.infrastructure.mongo import HotQuery, MongoIndex
+
+SAMPLE_THREAD = {"thread_id": "user:socrates", "checkpoint_ns": ""}
+SAMPLE_CHECKPOINT_ID = "1f000000-0000-6000-8000-000000000000"
+
+HOT_QUERIES = (
+    HotQuery(
+        name="latest checkpoint of a thread",
+        collection=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+        filter=SAMPLE_THREAD,
+        sort=(("checkpoint_id", -1),),
+        limit=1,
+    ),
+    HotQuery(
+        name="pending writes of a checkpoint",
+        collection=settings.MONGO_STATE_WRITES_COLLECTION,
+        filter={**SAMPLE_THREAD, "checkpoint_id": SAMPLE_CHECKPOINT_ID},
+    ),
+    HotQuery(
+        name="compaction of a thread's checkpoints",
+        collection=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+        filter={**SAMPLE_THREAD, "checkpoint_id": {"$lt": SAMPLE_CHECKPOINT_ID}},
+    ),
+    HotQuery(
+        name="compaction of a thread's writes",
+        collection=settings.MONGO_STATE_WRITES_COLLECTION,
+        filter={**SAMPLE_THREAD, "checkpoint_id": {"$lt": SAMPLE_CHECKPOINT_ID}},
+    ),
+    HotQuery(
+        name="reset of a user's checkpoints",
+        collection=settings.MONGO_STATE_CHECKPOINT_COLLECTION,
+        filter=user_thread_filter("user"),
+    ),
+    HotQuery(
+        name="reset of a user's writes",
+        collection=settings.MONGO_STATE_WRITES_COLLECTION,
+        filter=user_thread_filter("user"),
+    ),
+    HotQuery(
+        name="count of active sessions",
+        collection=settings.MONGO_SESSIONS_COLLECTION,
+        filter={"last_activity": {"$gt": datetime.now(timezone.utc)}},
+    ),
+)
+
+
+def async_command(f):
+    """Decorator to run an async click command."""
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        return asyncio.run(f(*args, **kwargs))
+
+    return wrapper
+
+
+@click.command()
+@click.option(
+    "--check/--no-check",
+    default=True,
+    help="Explain the hot queries and fail if any of them scans a whole collection.",
+)
+@async_command
+async def main(check: bool) -> None:
+    """CLI command to create the missing MongoDB indexes of the API.
+
+    Args:
+        check: Whether to check that the hot queries are served by an index.
+    """
+    client = AsyncMongoClient(settings.MONGO_URI, appname="philoagents")
+    try:
+        database = client[settings.MONGO_DB_NAME]
+
+        created = await MongoIndex.provision(database)
+        print(f"Indexes created: {len(created)}")
+        if not check:
+            return
+
+        plans = await MongoIndex.explain(database, HOT_QUERIES)
+        for plan in plans:
+            status = "COLLSCAN" if plan.is_collection_scan else "ok"
+            print(f"{status:<9} {plan.query.name}: {' <- '.join(plan.stages)}")
+    finally:
+        await client.close()
+
+    scans = [plan.query.name for plan in plans if plan.is_collection_scan]
+    if scans:
+        raise click.ClickException(
+            f"{len(scans)} hot queries scan a whole collection: {', '.join(scans)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -84,8 +84,10 @@ class WebSocketApiService {
       return;
     }
     
-    if (data.chunk) {
-      this.triggerCallback('chunk', data.chunk);
+    // Compact frames carry the chunk under "c"
+    const chunk = data.chunk ?? data.c;
+    if (chunk) {
+      this.triggerCallback('chunk', chunk);
       return;
     }
     